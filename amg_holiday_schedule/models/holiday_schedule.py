@@ -1,7 +1,33 @@
-from odoo import api, fields, models
+from bisect import bisect_left, bisect_right
+
+from odoo import api, fields, models, tools
 import logging
 _logger = logging.getLogger(__name__)
 
+# date.weekday() of the days that are never worked (Sunday)
+WEEKEND_DAYS = frozenset({6})
+
+
+def count_working_days(date_start, date_end, holiday_dates=()):
+    """Number of working days between ``date_start`` and ``date_end``, both
+    included: the days outside ``WEEKEND_DAYS`` minus the holidays.
+
+    :param holiday_dates: sorted sequence of the holidays falling on working
+        days, searched by bisection
+    """
+    if not date_start or not date_end or date_end < date_start:
+        return 0
+    total_days = (date_end - date_start).days + 1
+    full_weeks, remaining_days = divmod(total_days, 7)
+    working_days = full_weeks * (7 - len(WEEKEND_DAYS))
+    first_day = date_start.weekday()
+    working_days += sum(
+        1 for offset in range(remaining_days)
+        if (first_day + offset) % 7 not in WEEKEND_DAYS
+    )
+    holidays = bisect_right(holiday_dates, date_end) - bisect_left(holiday_dates, date_start)
+    return working_days - holidays
+
 
 class HolidaySchedule(models.Model):
     _name = 'holiday.schedule'
@@ -11,21 +37,64 @@ class HolidaySchedule(models.Model):
     active = fields.Boolean(default=True)
     line_ids = fields.One2many('holiday.schedule.line', 'schedule_id', string='Holiday Lines')
     company_id = fields.Many2one('res.company', string='Company', default=lambda self: self.env.company)
+    # Bumped from a database sequence whenever the lines change: the cached
+    # holiday dates are keyed by it, so no cache ever needs to be cleared
+    holiday_version = fields.Integer(readonly=True, copy=False, default=0)
+
+    def init(self):
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS holiday_schedule_version_seq")
+
+    def _bump_holiday_version(self):
+        """Give the schedules a new version, unique even across rolled back
+        transactions since sequences are not transactional."""
+        if not self.ids:
+            return
+        self.env.cr.execute(
+            "UPDATE holiday_schedule SET holiday_version = nextval('holiday_schedule_version_seq') WHERE id IN %s",
+            (tuple(self.ids),),
+        )
+        self.invalidate_recordset(['holiday_version'])
+
+    def get_holiday_dates(self):
+        """Sorted tuple of the holidays of this schedule falling on working days."""
+        self.ensure_one()
+        return self._get_holiday_dates(self.holiday_version)
+
+    @tools.ormcache('self.id', 'version')
+    def _get_holiday_dates(self, version):
+        self.env['holiday.schedule.line'].flush_model(['schedule_id', 'holiday_date'])
+        self.env.cr.execute(
+            "SELECT holiday_date FROM holiday_schedule_line WHERE schedule_id = %s ORDER BY holiday_date",
+            (self.id,),
+        )
+        return tuple(
+            holiday for holiday, in self.env.cr.fetchall()
+            if holiday.weekday() not in WEEKEND_DAYS
+        )
+
+    def count_working_days(self, date_start, date_end):
+        """Working days between both dates (included), minus the holidays of
+        this schedule; an empty recordset only removes the weekends."""
+        holiday_dates = self.get_holiday_dates() if self else ()
+        return count_working_days(date_start, date_end, holiday_dates)
+
+    @api.model
+    def get_company_holiday_dates(self, company=None):
+        """Sorted tuple of the holidays of all active schedules of ``company``
+        (default: current company) and of the schedules without company."""
+        company = company or self.env.company
+        schedules = self.search([('company_id', 'in', [company.id, False])], order='id')
+        versions = tuple((schedule.id, schedule.holiday_version) for schedule in schedules)
+        return self._get_company_holiday_dates(company.id, versions)
+
+    @tools.ormcache('company_id', 'versions')
+    def _get_company_holiday_dates(self, company_id, versions):
+        holiday_dates = set()
+        for schedule_id, version in versions:
+            holiday_dates.update(self.browse(schedule_id)._get_holiday_dates(version))
+        return tuple(sorted(holiday_dates))
 
-    @api.model_create_multi
-    def create(self, vals_list):
-        records = super().create(vals_list)
-        # Clear cache for KPI working days computation
-        self.env.cache.invalidate()
-        return records
-
-    def write(self, vals):
-        res = super().write(vals)
-        # Clear cache for KPI working days computation
-        self.env.cache.invalidate()
-        return res
-
-    def unlink(self):
-        # Clear cache for KPI working days computation
-        self.env.cache.invalidate()
-        return super().unlink()
\ No newline at end of file
+    @api.model
+    def count_company_working_days(self, date_start, date_end, company=None):
+        """Working days between both dates (included) for ``company``."""
+        return count_working_days(date_start, date_end, self.get_company_holiday_dates(company))
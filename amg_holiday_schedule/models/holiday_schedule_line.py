@@ -27,17 +27,20 @@ class HolidayScheduleLine(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        # Clear cache for KPI working days computation
-        self.env.cache.invalidate()
+        # The dependent computed fields (kpi.target.working_days) are
+        # recomputed through their @api.depends; only the version moves
+        records.schedule_id._bump_holiday_version()
         return records
 
     def write(self, vals):
+        schedules = self.schedule_id
         res = super().write(vals)
-        # Clear cache for KPI working days computation
-        self.env.cache.invalidate()
+        if {'schedule_id', 'holiday_date'}.intersection(vals):
+            (schedules | self.schedule_id)._bump_holiday_version()
         return res
 
     def unlink(self):
-        # Clear cache for KPI working days computation
-        self.env.cache.invalidate()
-        return super().unlink()
\ No newline at end of file
+        schedules = self.schedule_id
+        res = super().unlink()
+        schedules.exists()._bump_holiday_version()
+        return res
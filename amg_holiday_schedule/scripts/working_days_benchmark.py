@@ -0,0 +1,52 @@
+"""Micro-benchmark of count_working_days against the day-by-day loop.
+
+Run from an Odoo shell (only the addons path is needed, no data is read)::
+
+    odoo-bin shell -d <db> < amg_holiday_schedule/scripts/working_days_benchmark.py
+"""
+import random
+import timeit
+from datetime import date, timedelta
+
+from odoo.addons.amg_holiday_schedule.models.holiday_schedule import WEEKEND_DAYS, count_working_days
+
+YEARS = 10
+HOLIDAYS_PER_YEAR = 15
+PERIODS = 1000
+
+
+def count_working_days_loop(date_start, date_end, holiday_dates):
+    """Previous implementation of kpi.target._compute_working_days."""
+    holiday_dates = set(holiday_dates)
+    count = 0
+    current_date = date_start
+    while current_date <= date_end:
+        if current_date.weekday() not in WEEKEND_DAYS and current_date not in holiday_dates:
+            count += 1
+        current_date += timedelta(days=1)
+    return count
+
+
+def benchmark():
+    rnd = random.Random(42)
+    first_day = date(2020, 1, 1)
+    span = YEARS * 365
+    holidays = {first_day + timedelta(days=rnd.randrange(span)) for _i in range(YEARS * HOLIDAYS_PER_YEAR)}
+    working_holidays = tuple(sorted(day for day in holidays if day.weekday() not in WEEKEND_DAYS))
+    periods = []
+    for _i in range(PERIODS):
+        start = first_day + timedelta(days=rnd.randrange(span))
+        periods.append((start, start + timedelta(days=rnd.choice([6, 30, 91, 365]))))
+
+    for start, end in periods:
+        assert count_working_days(start, end, working_holidays) == count_working_days_loop(start, end, holidays)
+
+    for label, func in [
+        ("day-by-day loop", lambda: [count_working_days_loop(s, e, holidays) for s, e in periods]),
+        ("bisect", lambda: [count_working_days(s, e, working_holidays) for s, e in periods]),
+    ]:
+        runs = timeit.repeat(func, number=1, repeat=5)
+        print("%-16s %8.3f ms per %d periods" % (label, min(runs) * 1000, PERIODS))
+
+
+benchmark()
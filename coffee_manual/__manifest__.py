@@ -17,6 +17,7 @@
         "views/actions.xml",
         "views/menu.xml", # This file will be modified in the next step
         "views/templates.xml",
+        "data/search_index.xml",
     ],
     "assets": {
         "web.assets_frontend": [
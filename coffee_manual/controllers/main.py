@@ -10,11 +10,14 @@ class CoffeeManualController(http.Controller):
     @http.route("/coffee/manual", type="http", auth="user", website=True)
     def manual(self, **kwargs):
         sections = request.env["coffee.manual.section"].sudo().search([], order="sequence, id")
+        # progress of every section in one query, keyed by section key
+        section_keys = {s.id: s.key for s in sections}
         progress = {
-            s.key: request.env["coffee.manual.progress"].sudo().search([
-                ("user_id", "=", request.env.user.id), ("section_id", "=", s.id)
-            ], limit=1)
-            for s in sections
+            section_keys[p["section_id"][0]]: p
+            for p in request.env["coffee.manual.progress"].sudo().search_read(
+                [("user_id", "=", request.env.user.id), ("section_id", "in", sections.ids)],
+                ["section_id", "status", "completed_at"],
+            )
         }
         values = {
             "sections": sections,
@@ -32,38 +35,14 @@ class CoffeeManualController(http.Controller):
         quiz = request.env["coffee.manual.quiz"].sudo().browse(int(quiz_id))
         if not quiz.exists():
             return {"ok": False, "message": "Quiz not found"}
-        total = len(quiz.question_ids)
-        correct = 0
-        Answer = request.env["coffee.manual.quiz.answer"].sudo()
-        # remove previous answers from this user for this quiz
-        prev = Answer.search([("user_id", "=", request.env.user.id), ("quiz_id", "=", quiz.id)])
-        if prev:
-            prev.unlink()
-        for q in quiz.question_ids:
-            sel = answers.get(str(q.id))
-            if sel not in {"a", "b", "c", "d"}:
-                continue
-            ans = Answer.create({
-                "user_id": request.env.user.id,
-                "quiz_id": quiz.id,
-                "question_id": q.id,
-                "selected": sel,
-            })
-            if ans.is_correct:
-                correct += 1
+        correct, total = quiz.submit_answers(answers)
         score = int((correct / total) * 100) if total else 0
         return {"ok": True, "score": score, "correct": correct, "total": total}
 
     @http.route("/coffee/manual/search", type="json", auth="user")
     def search(self, q: str):
-        # basic keyword search over static content snippets
+        # ranked full-text search over the prebuilt index of the sections
         if not q:
             return {"results": []}
-        corpus = request.env["ir.ui.view"].sudo().read_template("coffee_manual.manual_content_index")
-        results = []
-        for line in corpus.splitlines():
-            if q.lower() in line.lower():
-                results.append(line.strip())
-                if len(results) >= 10:
-                    break
+        results = request.env["coffee.manual.search.entry"].sudo().search_manual(q, limit=10)
         return {"results": results}
@@ -1,3 +1,4 @@
 from . import section  # noqa: F401
 from . import progress  # noqa: F401
-from . import quiz  # noqa: F401
\ No newline at end of file
+from . import quiz  # noqa: F401
+from . import search_entry  # noqa: F401
\ No newline at end of file
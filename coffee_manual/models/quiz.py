@@ -4,6 +4,10 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+ANSWER_OPTIONS = [
+    ("a", "A"), ("b", "B"), ("c", "C"), ("d", "D"),
+]
+
 
 class CoffeeManualQuiz(models.Model):
     _name = "coffee.manual.quiz"
@@ -15,6 +19,59 @@ class CoffeeManualQuiz(models.Model):
     sequence = fields.Integer(default=10)
     question_ids = fields.One2many("coffee.manual.quiz.question", "quiz_id")
 
+    def submit_answers(self, answers):
+        """Grade and store the answers of the current user to this quiz.
+
+        Grading is done in memory from one read of the correct options. The
+        answers are upserted on (user, quiz, question) with a single
+        ``INSERT ... ON CONFLICT``, so concurrent submits (a double click, a
+        retry) update the same rows; the answers of questions left blank are
+        removed.
+
+        :param answers: ``{question_id (str): "a" | "b" | "c" | "d"}``
+        :return: ``(correct, total)``
+        """
+        self.ensure_one()
+        options = {key for key, _label in ANSWER_OPTIONS}
+        questions = self.question_ids.read(["correct"])
+        correct_options = {question["id"]: question["correct"] for question in questions}
+        selected = {}
+        for question in questions:
+            option = answers.get(str(question["id"]))
+            if option in options:
+                selected[question["id"]] = option
+        correct = sum(1 for question_id, option in selected.items() if option == correct_options[question_id])
+
+        Answer = self.env["coffee.manual.quiz.answer"]
+        user_id = self.env.user.id
+        Answer.search([
+            ("user_id", "=", user_id),
+            ("quiz_id", "=", self.id),
+            ("question_id", "not in", list(selected)),
+        ]).unlink()
+        if selected:
+            Answer.flush_model()
+            now = self.env.cr.now()
+            rows = [
+                (user_id, self.id, question_id, option, option == correct_options[question_id],
+                 user_id, now, user_id, now)
+                for question_id, option in selected.items()
+            ]
+            # is_correct is written with the row, no recompute is left pending
+            self.env.cr.execute("""
+                INSERT INTO coffee_manual_quiz_answer
+                       (user_id, quiz_id, question_id, selected, is_correct,
+                        create_uid, create_date, write_uid, write_date)
+                VALUES %s
+                ON CONFLICT (user_id, quiz_id, question_id) DO UPDATE
+                   SET selected = EXCLUDED.selected,
+                       is_correct = EXCLUDED.is_correct,
+                       write_uid = EXCLUDED.write_uid,
+                       write_date = EXCLUDED.write_date
+            """ % ", ".join(["%s"] * len(rows)), rows)
+            Answer.invalidate_model(["selected", "is_correct", "write_uid", "write_date"])
+        return correct, len(questions)
+
 
 class CoffeeManualQuizQuestion(models.Model):
     _name = "coffee.manual.quiz.question"
@@ -28,22 +85,22 @@ class CoffeeManualQuizQuestion(models.Model):
     option_b = fields.Char(required=True)
     option_c = fields.Char(required=True)
     option_d = fields.Char(required=True)
-    correct = fields.Selection([
-        ("a", "A"), ("b", "B"), ("c", "C"), ("d", "D"),
-    ], required=True)
+    correct = fields.Selection(ANSWER_OPTIONS, required=True)
 
 
 class CoffeeManualQuizAnswer(models.Model):
     _name = "coffee.manual.quiz.answer"
     _description = "Coffee Manual Quiz Answer"
     _order = "create_date desc"
+    _sql_constraints = [
+        ("coffee_manual_quiz_answer_unique", "unique(user_id, quiz_id, question_id)",
+         "A user answers each quiz question once."),
+    ]
 
     user_id = fields.Many2one("res.users", required=True, ondelete="cascade")
     quiz_id = fields.Many2one("coffee.manual.quiz", required=True, ondelete="cascade")
     question_id = fields.Many2one("coffee.manual.quiz.question", required=True, ondelete="cascade")
-    selected = fields.Selection([
-        ("a", "A"), ("b", "B"), ("c", "C"), ("d", "D"),
-    ], required=True)
+    selected = fields.Selection(ANSWER_OPTIONS, required=True)
     is_correct = fields.Boolean(compute="_compute_is_correct", store=True)
 
     @api.depends("selected", "question_id.correct")
@@ -0,0 +1,129 @@
+import re
+
+from lxml import html
+from markupsafe import Markup, escape
+
+from odoo import api, fields, models
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Text search configuration of the manual (English stemming)
+SEARCH_CONFIG = "english"
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5"}
+# Highlight delimiters never found in the manual, swapped for <mark> once escaped
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+
+class CoffeeManualSearchEntry(models.Model):
+    """One searchable chunk of the manual: a heading and the text below it.
+
+    The entries are rebuilt from the section templates on module install and
+    update. ``content_tsv`` is a generated ``tsvector`` column with a GIN
+    index, so searches never render the templates.
+    """
+    _name = "coffee.manual.search.entry"
+    _description = "Coffee Manual Search Entry"
+    _order = "section_id, sequence, id"
+
+    section_id = fields.Many2one("coffee.manual.section", required=True, ondelete="cascade")
+    sequence = fields.Integer(default=10)
+    heading = fields.Char()
+    content = fields.Text()
+
+    def init(self):
+        cr = self.env.cr
+        cr.execute(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = %s AND column_name = 'content_tsv'",
+            (self._table,),
+        )
+        if not cr.fetchone():
+            cr.execute("""
+                ALTER TABLE coffee_manual_search_entry ADD COLUMN content_tsv tsvector
+                    GENERATED ALWAYS AS (
+                        setweight(to_tsvector('%(config)s', coalesce(heading, '')), 'A')
+                        || setweight(to_tsvector('%(config)s', coalesce(content, '')), 'B')
+                    ) STORED
+            """ % {"config": SEARCH_CONFIG})
+        cr.execute("""
+            CREATE INDEX IF NOT EXISTS coffee_manual_search_entry_content_tsv_index
+                ON coffee_manual_search_entry USING GIN (content_tsv)
+        """)
+
+    @api.model
+    def _rebuild_index(self):
+        """Split every section template on its headings and store the chunks."""
+        sections = self.env["coffee.manual.section"].search([])
+        vals_list = []
+        for section in sections:
+            rendered = self.env["ir.qweb"]._render("coffee_manual.section_%s" % section.key, {})
+            heading, texts, sequence = False, [], 0
+            for node in html.fragments_fromstring(str(rendered)):
+                if isinstance(node, str):
+                    texts.append(node)
+                    continue
+                if node.tag in HEADING_TAGS:
+                    if heading or texts:
+                        vals_list.append(self._prepare_entry(section, sequence, heading, texts))
+                        sequence += 1
+                    heading, texts = node.text_content(), []
+                else:
+                    texts.append(node.text_content())
+                texts.append(node.tail or "")
+            if heading or texts:
+                vals_list.append(self._prepare_entry(section, sequence, heading, texts))
+        self.search([]).unlink()
+        self.create(vals_list)
+        _logger.info("Indexed %s coffee manual entries", len(vals_list))
+        return True
+
+    def _prepare_entry(self, section, sequence, heading, texts):
+        return {
+            "section_id": section.id,
+            "sequence": sequence,
+            "heading": " ".join((heading or "").split()),
+            "content": " ".join(" ".join(texts).split()),
+        }
+
+    @api.model
+    def search_manual(self, query, limit=10):
+        """Ranked full-text search; every word of ``query`` matches as a prefix.
+
+        :return: list of dicts with ``section_key``, ``anchor``, ``heading``,
+            ``snippet`` (HTML, matches wrapped in ``<mark>``) and ``rank``
+        """
+        words = re.findall(r"\w+", (query or "").lower())
+        if not words:
+            return []
+        tsquery = " & ".join("%s:*" % word for word in words)
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT s.key, s.anchor, e.heading,
+                   ts_headline(%s, e.content, q.query, %s),
+                   ts_rank(e.content_tsv, q.query) AS rank
+              FROM coffee_manual_search_entry e
+              JOIN coffee_manual_section s ON s.id = e.section_id,
+                   to_tsquery(%s, %s) AS q(query)
+             WHERE e.content_tsv @@ q.query
+          ORDER BY rank DESC, s.sequence, e.sequence
+             LIMIT %s
+        """, (
+            SEARCH_CONFIG,
+            'StartSel="%s", StopSel="%s", MaxFragments=2, MaxWords=20, MinWords=6' % (HIGHLIGHT_START, HIGHLIGHT_STOP),
+            SEARCH_CONFIG, tsquery, limit,
+        ))
+        return [
+            {
+                "section_key": key,
+                "anchor": anchor,
+                "heading": heading,
+                "snippet": str(
+                    escape(snippet)
+                    .replace(HIGHLIGHT_START, Markup("<mark>"))
+                    .replace(HIGHLIGHT_STOP, Markup("</mark>"))
+                ),
+                "rank": rank,
+            }
+            for key, anchor, heading, snippet, rank in self.env.cr.fetchall()
+        ]
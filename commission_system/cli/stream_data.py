@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Streaming import/export of commission, KPI and coffee arrival data.
+
+Moves the records between databases without going through the import
+dialog, which reads whole files in memory::
+
+    odoo-bin stream_data -c odoo.conf -d <db> --model commission_system.records --export records.csv
+    odoo-bin stream_data -c odoo.conf -d <db> --model commission_system.records --import records.csv
+
+Files are CSV (the column headers of the import dialog, e.g. ``agent_id/id``)
+or JSON Lines, read and written ``--chunk-size`` rows at a time. Every chunk
+is committed on its own and recorded in a ``<file>.checkpoint`` file, so an
+interrupted run resumes after the last committed chunk (``--restart``
+ignores the checkpoint); the checkpoint is removed once the file is done.
+
+Imported chunks are created with the ``stream_import`` context key: the
+per-record create hooks (audit log, worksheet auto-assignment) are skipped
+and the model's ``_stream_import_reconcile`` runs once on the whole chunk.
+Exported files carry an ``id`` column of external ids, so importing the same
+rows twice updates the records instead of duplicating them.
+"""
+import csv
+import json
+import logging
+import optparse
+import os
+import sys
+from itertools import islice
+from pathlib import Path
+
+import odoo
+from odoo import SUPERUSER_ID, api, models
+from odoo.cli import Command
+from odoo.tools import config
+from odoo.tools.safe_eval import safe_eval
+
+_logger = logging.getLogger(__name__)
+
+STREAM_MODELS = (
+    'commission_system.records',
+    'kpi.target',
+    'kpi.target.line',
+    'coffee.arrival',
+)
+# Mail side effects that make no sense for data moved between databases
+STREAM_CONTEXT = {
+    'stream_import': True,
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+}
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _file_format(path, file_format=None):
+    if file_format:
+        return file_format
+    return 'jsonl' if Path(path).suffix.lower() in ('.jsonl', '.ndjson') else 'csv'
+
+
+def _read_checkpoint(path):
+    try:
+        with open(path, encoding='utf-8') as checkpoint:
+            return json.load(checkpoint)
+    except FileNotFoundError:
+        return None
+
+
+def _write_checkpoint(path, data):
+    """Replace the checkpoint atomically, a crash never leaves half a file."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as checkpoint:
+        json.dump(data, checkpoint)
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+    os.replace(tmp_path, path)
+
+
+def _import_value(value):
+    """JSON value to the string ``load`` expects for it."""
+    if value is None or value is False:
+        return ''
+    if value is True:
+        return '1'
+    if isinstance(value, list):
+        return ','.join(str(item) for item in value)
+    return str(value)
+
+
+def read_chunks(path, file_format, chunk_size, skip=0):
+    """Yield ``(fields, rows)`` chunks of the file, ``skip`` data rows ignored.
+
+    Only one chunk is held in memory; JSONL chunks take the keys of their
+    objects as fields.
+    """
+    if file_format == 'csv':
+        with open(path, newline='', encoding='utf-8-sig') as stream:
+            reader = csv.reader(stream)
+            fields = next(reader, None)
+            if not fields:
+                return
+            rows = islice(reader, skip, None)
+            while chunk := list(islice(rows, chunk_size)):
+                yield fields, chunk
+    else:
+        with open(path, encoding='utf-8') as stream:
+            objects = (json.loads(line) for line in stream if line.strip())
+            objects = islice(objects, skip, None)
+            while chunk := list(islice(objects, chunk_size)):
+                fields = list(dict.fromkeys(key for obj in chunk for key in obj))
+                yield fields, [[_import_value(obj.get(field)) for field in fields] for obj in chunk]
+
+
+def default_export_fields(model):
+    """Stored fields a record needs to be re-imported, relations as external ids."""
+    mixin_fields = set()
+    for mixin in ('mail.thread', 'mail.activity.mixin'):
+        if mixin in model.env:
+            mixin_fields.update(model.env[mixin]._fields)
+    export_fields = ['id']
+    for name, field in model._fields.items():
+        if (not field.store or field.compute or field.automatic or name in mixin_fields
+                or name in models.LOG_ACCESS_COLUMNS or field.type in ('one2many', 'binary')):
+            continue
+        export_fields.append('%s/id' % name if field.relational else name)
+    return export_fields
+
+
+def import_file(env, model_name, path, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE, restart=False):
+    """Import ``path`` into ``model_name``, committing every chunk.
+
+    :return: number of records imported by this run
+    """
+    file_format = _file_format(path, file_format)
+    checkpoint_path = path + '.checkpoint'
+    checkpoint = None if restart else _read_checkpoint(checkpoint_path)
+    done = checkpoint['rows'] if checkpoint else 0
+    if done:
+        _logger.info("Resuming the import of %s after %s rows", path, done)
+    model = env[model_name].with_context(**STREAM_CONTEXT)
+    cr = env.cr
+    count = 0
+    for fields, rows in read_chunks(path, file_format, chunk_size, skip=done):
+        result = model.load(fields, rows)
+        errors = [message for message in result['messages'] if message['type'] == 'error']
+        if errors:
+            cr.rollback()
+            for message in errors:
+                _logger.error("%s: row %s: %s", path, done + message.get('record', 0) + 1, message['message'])
+            raise ValueError("Import of %s stopped after %s rows, fix the file and run it again" % (path, done))
+        records = model.browse(result['ids'] or [])
+        if hasattr(records, '_stream_import_reconcile'):
+            records._stream_import_reconcile()
+        cr.commit()
+        done += len(rows)
+        count += len(records)
+        _write_checkpoint(checkpoint_path, {'model': model_name, 'rows': done})
+        env.invalidate_all()
+        _logger.info("%s: %s rows imported into %s", path, done, model_name)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return count
+
+
+def export_file(env, model_name, path, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                domain=None, fields=None, restart=False):
+    """Export the records of ``model_name`` to ``path``, a chunk at a time.
+
+    Records are paged by id, so the export resumes after the last written
+    record and never offsets through the table.
+
+    :return: number of records exported by this run
+    """
+    file_format = _file_format(path, file_format)
+    checkpoint_path = path + '.checkpoint'
+    checkpoint = None if restart else _read_checkpoint(checkpoint_path)
+    model = env[model_name].with_context(active_test=False)
+    if checkpoint:
+        fields = checkpoint['fields']
+    fields = fields or default_export_fields(model)
+    last_id = checkpoint['last_id'] if checkpoint else 0
+    count = 0
+    with open(path, 'r+' if checkpoint else 'w', newline='', encoding='utf-8') as stream:
+        if checkpoint:
+            # Drop whatever was written after the last committed chunk
+            stream.seek(checkpoint['position'])
+            stream.truncate()
+            _logger.info("Resuming the export of %s after record %s", path, last_id)
+        writer = csv.writer(stream) if file_format == 'csv' else None
+        if writer and not checkpoint:
+            writer.writerow(fields)
+        while records := model.search((domain or []) + [('id', '>', last_id)], order='id', limit=chunk_size):
+            rows = records.export_data(fields)['datas']
+            if writer:
+                writer.writerows(rows)
+            else:
+                stream.writelines(json.dumps(dict(zip(fields, row)), default=str) + '\n' for row in rows)
+            stream.flush()
+            os.fsync(stream.fileno())
+            # export_data creates the missing external ids
+            env.cr.commit()
+            last_id = records[-1].id
+            count += len(records)
+            _write_checkpoint(checkpoint_path, {
+                'model': model_name, 'fields': fields, 'last_id': last_id, 'position': stream.tell(),
+            })
+            env.invalidate_all()
+            _logger.info("%s: exported %s records of %s up to id %s", path, count, model_name, last_id)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return count
+
+
+class StreamData(Command):
+    """Stream commission, KPI and coffee arrival records from or to CSV/JSONL files"""
+    name = 'stream_data'
+
+    def run(self, cmdargs):
+        parser = config.parser
+        parser.prog = f'{Path(sys.argv[0]).name} {self.name}'
+        group = optparse.OptionGroup(parser, "Stream Data Configuration")
+        group.add_option("--model", dest="stream_model", help="One of: %s" % ", ".join(STREAM_MODELS))
+        group.add_option("--import", dest="stream_import", metavar="FILE", help="Import the records of FILE")
+        group.add_option("--export", dest="stream_export", metavar="FILE", help="Export the records to FILE")
+        group.add_option("--format", dest="stream_format", type="choice", choices=["csv", "jsonl"],
+                         help="File format, guessed from the file extension by default")
+        group.add_option("--chunk-size", dest="stream_chunk_size", type="int", default=DEFAULT_CHUNK_SIZE,
+                         help="Rows per chunk and commit (default %default)")
+        group.add_option("--fields", dest="stream_fields",
+                         help="Comma-separated field paths to export (default: all stored fields)")
+        group.add_option("--domain", dest="stream_domain", default="[]", help="Domain of the exported records")
+        group.add_option("--restart", dest="stream_restart", action="store_true", default=False,
+                         help="Ignore the checkpoint of a previous run")
+        parser.add_option_group(group)
+        opt = config.parse_config(cmdargs)
+
+        if opt.stream_model not in STREAM_MODELS:
+            sys.exit("--model must be one of: %s" % ", ".join(STREAM_MODELS))
+        if bool(opt.stream_import) == bool(opt.stream_export):
+            sys.exit("Give exactly one of --import or --export")
+        if opt.stream_chunk_size < 1:
+            sys.exit("--chunk-size must be positive")
+        dbname = config['db_name']
+        if not dbname:
+            sys.exit("No database given, use -d")
+
+        registry = odoo.registry(dbname)
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            if opt.stream_model not in env:
+                sys.exit("Model %s is not installed in %s" % (opt.stream_model, dbname))
+            if opt.stream_import:
+                count = import_file(
+                    env, opt.stream_model, opt.stream_import, opt.stream_format,
+                    opt.stream_chunk_size, opt.stream_restart,
+                )
+            else:
+                count = export_file(
+                    env, opt.stream_model, opt.stream_export, opt.stream_format, opt.stream_chunk_size,
+                    domain=safe_eval(opt.stream_domain),
+                    fields=opt.stream_fields and opt.stream_fields.split(','),
+                    restart=opt.stream_restart,
+                )
+            _logger.info("Done: %s records of %s", count, opt.stream_model)
@@ -7,13 +7,37 @@ from werkzeug.utils import redirect
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from odoo.tools.misc import format_date
+from odoo.tools.translate import _lt
 import traceback
 import logging
+from collections import defaultdict
 
 from odoo.exceptions import UserError, ValidationError
+from odoo.osv import expression
 
 _logger = logging.getLogger(__name__)
 
+# Target states a commission record may move to from each state
+RECORD_STATE_TRANSITIONS = {
+    'draft': ['checked'],
+    'checked': ['approved', 'draft'],
+    'approved': ['billed', 'checked'],
+    'billed': ['confirmed', 'approved', 'billed'],
+    'confirmed': ['billed', 'confirmed', 'audited'],
+    'audited': ['confirmed', 'audited', 'paid'],
+    'paid': ['completed', 'audited'],  # Allow transition to completed
+    'completed': []  # Final state
+}
+# Group required to move a commission record to a state, and the error without it
+RECORD_STATE_GROUPS = {
+    'checked': ('commission_system.group_commission_check', _lt("You are not allowed to check commissions.")),
+    'approved': ('commission_system.group_commission_approve', _lt("You are not allowed to approve commissions.")),
+    'confirmed': ('commission_system.group_commission_confirm',
+                  _lt("You are not allowed to Confirm bill commissions.")),
+    'audited': ('commission_system.group_commission_audit', _lt("You are not allowed to Audit bill commissions.")),
+    'paid': ('commission_system.group_commission_pay', _lt("You are not allowed to pay bill commissions.")),
+}
+
 
 class BaseAuditMixin(models.AbstractModel):
     _name = 'base.audit.mixin'
@@ -21,23 +45,21 @@ class BaseAuditMixin(models.AbstractModel):
 
     def log_activity(self, action, description=None):
         """Create an audit log entry."""
-        logs = []
-        user_id = self.env.user.id
-        ip_address = self.env.context.get('ip_address', 'Unknown')
-
-        for record in self:
-            logs.append({
-                'user_id': user_id,
-                'action': action,
-                'model_name': record._name,
-                'record_id': record.id,
-                'description': description,
-                'ip_address': ip_address,
-            })
-
+        logs = [record._prepare_activity_log(action, description) for record in self]
         if logs:
             self.env['commission_system.user_activity_log'].create(logs)
 
+    def _prepare_activity_log(self, action, description=None):
+        """Values of the audit log entry of one record."""
+        return {
+            'user_id': self.env.user.id,
+            'action': action,
+            'model_name': self._name,
+            'record_id': self.id,
+            'description': description,
+            'ip_address': self.env.context.get('ip_address', 'Unknown'),
+        }
+
     def log_custom_action(self, description):
         """Log custom user actions that are not CRUD."""
         self.log_activity('custom', description)
@@ -45,28 +67,46 @@ class BaseAuditMixin(models.AbstractModel):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
+        if self.env.context.get('stream_import'):
+            # Logged per chunk by _stream_import_reconcile
+            return records
         for record in records:
             record.log_activity('create', f'Created record with ID {record.id}')
         return records
 
+    def _stream_import_reconcile(self):
+        """Post-process a chunk of streamed records, see the stream_data command."""
+        self.env['commission_system.user_activity_log'].create([
+            record._prepare_activity_log('create', f'Imported record with ID {record.id}')
+            for record in self
+        ])
+
     def write(self, vals):
         """Log which fields changed, including old and new values."""
         ignored_fields = {'__last_update', 'write_date'}
+        logged_fields = [
+            field for field in vals
+            if field not in ignored_fields and field in self._fields
+        ]
+
+        # The new value of a many2one is the same for all the records
+        new_displays = {}
+        for field in logged_fields:
+            if self._fields[field].type == 'many2one':
+                new_record = self.env[self._fields[field].comodel_name].browse(vals[field])
+                new_displays[field] = new_record.name if new_record.exists() else 'None'
 
+        logs = []
         for record in self:
             changes = []
-            for field, new_value in vals.items():
-                if field in ignored_fields or not hasattr(record, field):
-                    continue
-
+            for field in logged_fields:
+                new_value = vals[field]
                 old_value = record[field]
 
                 # Handle many2one fields
-                field_type = record._fields[field].type
-                if field_type == 'many2one':
+                if field in new_displays:
                     old_display = old_value.name if old_value else 'None'
-                    new_record = self.env[record._fields[field].comodel_name].browse(new_value)
-                    new_display = new_record.name if new_record.exists() else 'None'
+                    new_display = new_displays[field]
                     if old_display != new_display:
                         changes.append(f"{field}: {old_display} → {new_display}")
                 else:
@@ -75,7 +115,11 @@ class BaseAuditMixin(models.AbstractModel):
 
             if changes:
                 description = "Updated fields: " + ", ".join(changes)
-                record.log_activity('update', description)
+                logs.append(record._prepare_activity_log('update', description))
+
+        # One audit batch for the whole write
+        if logs:
+            self.env['commission_system.user_activity_log'].create(logs)
 
         return super().write(vals)
 
@@ -336,14 +380,150 @@ class CommissionRecords(models.Model):
                 ) % (rec.name, rec.sales_order_id.name))
         return super().unlink()
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Override create to handle automatic worksheet linking"""
-        record = super().create(vals)
-        state = vals.get('state', 'draft')
-        if state in ['draft', 'checked', 'approved']:
-            record._auto_assign_to_worksheet()
-        return record
+        records = super().create(vals_list)
+        if self.env.context.get('stream_import'):
+            # Assigned per chunk by _stream_import_reconcile
+            return records
+        for record, vals in zip(records, vals_list):
+            state = vals.get('state', 'draft')
+            if state in ['draft', 'checked', 'approved']:
+                record._auto_assign_to_worksheet()
+        return records
+
+    def _stream_import_reconcile(self):
+        super()._stream_import_reconcile()
+        self.filtered(lambda r: r.state in ['draft', 'checked', 'approved'])._auto_assign_to_worksheets()
+
+    def _get_state_change_errors(self, new_state):
+        """Validate moving the records to ``new_state`` without writing anything.
+
+        :return: ``{record id: error message}`` of the records that cannot
+            make the transition, in the order of ``self``
+        """
+        errors = {}
+        changing = self.filtered(lambda r: r.state != new_state)
+        if not changing:
+            return errors
+
+        # Group membership is the same for every record, check it once
+        group_xmlid, group_error, allowed_from = self._get_state_transition_table().get(
+            new_state, (False, False, frozenset())
+        )
+        group_error = group_xmlid and not self.env.user.has_group(group_xmlid) and str(group_error)
+
+        for record in changing:
+            current_state = record.state
+
+            # Add validation for completed state
+            if new_state == 'completed' and current_state != 'paid':
+                errors[record.id] = _("Only paid commission records can be marked as completed.")
+
+            elif group_error:
+                errors[record.id] = group_error
+
+            # Validate transition
+            elif current_state not in allowed_from:
+                errors[record.id] = _(
+                    "Invalid transition from %(current)s to %(new)s.\n"
+                    "Allowed: %(allowed)s"
+                ) % {
+                    'current': current_state,
+                    'new': new_state,
+                    'allowed': " → ".join(RECORD_STATE_TRANSITIONS.get(current_state, []))
+                }
+        return errors
+
+    def _get_state_tracking_values(self, current_state, new_state, now):
+        """Tracking fields to write when moving records from ``current_state``
+        to ``new_state``: the user and date of the new state are set, those
+        of the states after it cleared when reverting."""
+        # Skip if state isn't changing
+        if current_state == new_state:
+            return {}
+        user_id = self.env.user.id
+
+        # Field updates - both setting and clearing
+        if new_state == 'completed':
+            return {
+                # No specific user tracking for completed state
+                # as it's automatically set via bill summary
+            }
+        elif new_state == 'checked':
+            return {
+                'checked_by': user_id,
+                'checked_date': now,
+                'approved_by': False,
+                'approved_date': False,
+                'confirmed_by': False,  # Clear if reverting
+                'confirmed_date': False,
+                'audited_by': False,
+                'audited_date': False,
+                'paid_by': False,
+                'paid_date': False
+            }
+        elif new_state == 'approved':
+            return {
+                'approved_by': user_id,
+                'approved_date': now,
+                'confirmed_by': False,  # Clear if reverting
+                'confirmed_date': False,
+                'audited_by': False,
+                'audited_date': False,
+                'paid_by': False,
+                'paid_date': False
+            }
+        elif new_state == 'confirmed':
+            return {
+                'confirmed_by': user_id,
+                'confirmed_date': now,
+                'audited_by': False,
+                'audited_date': False
+            }
+        elif new_state == 'audited':
+            return {
+                'audited_by': user_id,
+                'audited_date': now
+            }
+        elif new_state == 'paid':
+            return {
+                'paid_by': user_id,
+                'paid_date': now
+            }
+        elif new_state == 'billed' and current_state == 'confirmed':
+            # Special handling for revert - clear confirmation fields
+            return {
+                'confirmed_by': False,
+                'confirmed_date': False,
+                'audited_by': False,
+                'audited_date': False,
+                'paid_by': False,
+                'paid_date': False
+            }
+        elif new_state == 'draft' and current_state == 'checked':
+            return {
+                'checked_by': False,
+                'checked_date': False
+            }
+        return {}
+
+    @api.model
+    @tools.ormcache()
+    def _get_state_transition_table(self):
+        """``{new state: (group xmlid, error without it, allowed current states)}``
+        compiled from RECORD_STATE_TRANSITIONS and RECORD_STATE_GROUPS."""
+        return {
+            new_state: (
+                *RECORD_STATE_GROUPS.get(new_state, (False, False)),
+                frozenset(
+                    state for state, targets in RECORD_STATE_TRANSITIONS.items()
+                    if new_state in targets
+                ),
+            )
+            for new_state, _label in self._fields['state'].selection
+        }
 
     def write(self, vals):
         """Complete state synchronization with proper field clearing"""
@@ -351,134 +531,23 @@ class CommissionRecords(models.Model):
             new_state = vals['state']
             current_states = {rec.id: rec.state for rec in self}
 
-            user = self.env.user
-            group_check = self.env.ref('commission_system.group_commission_check')
-            group_approve = self.env.ref('commission_system.group_commission_approve')
-            group_confirm = self.env.ref('commission_system.group_commission_confirm')
-            group_audit = self.env.ref('commission_system.group_commission_audit')
-            group_pay = self.env.ref('commission_system.group_commission_pay')
+            errors = self._get_state_change_errors(new_state)
+            if errors:
+                raise UserError(next(iter(errors.values())))
 
-            # Prepare field updates including clearing confirmed/paid fields when reverting
-            tracking_updates = {}
+            # One write per transition, carrying the state and the tracking
+            # fields of that transition
+            record_ids_by_state = defaultdict(list)
             for record in self:
-                current_state = current_states[record.id]
-
-                # Skip if state isn't changing
-                if current_state == new_state:
-                    continue
-
-                # Add validation for completed state
-                if new_state == 'completed' and current_state != 'paid':
-                    raise UserError(_("Only paid commission records can be marked as completed."))
-
-                if new_state == 'checked' and user not in group_check.users:
-                    raise UserError(_("You are not allowed to check commissions."))
-
-                if new_state == 'approved' and user not in group_approve.users:
-                    raise UserError(_("You are not allowed to approve commissions."))
-                if new_state == 'confirmed' and user not in group_confirm.users:
-                    raise UserError(_("You are not allowed to Confirm bill commissions."))
-                if new_state == 'audited' and user not in group_audit.users:
-                    raise UserError(_("You are not allowed to Audit bill commissions."))
-
-                if new_state == 'paid' and user not in group_pay.users:
-                    raise UserError(_("You are not allowed to pay bill commissions."))
-
-                # Validate transition
-                allowed_transitions = {
-                    'draft': ['checked'],
-                    'checked': ['approved', 'draft'],
-                    'approved': ['billed', 'checked'],
-                    'billed': ['confirmed', 'approved', 'billed'],
-                    'confirmed': ['billed', 'confirmed', 'audited'],
-                    'audited': ['confirmed', 'audited', 'paid'],
-                    'paid': ['completed', 'audited'],  # Allow transition to completed
-                    'completed': []  # Final state
-                }
-
-                # Special case for checked->confirmed in approved worksheets
-                if not (current_state == 'checked' and new_state == 'confirmed' and new_state == 'audited' and
-                        record.worksheet_id and record.worksheet_id.state == 'approved'):
-                    if new_state not in allowed_transitions.get(current_state, []):
-                        raise UserError(_(
-                            "Invalid transition from %(current)s to %(new)s.\n"
-                            "Allowed: %(allowed)s"
-                        ) % {
-                                            'current': current_state,
-                                            'new': new_state,
-                                            'allowed': " → ".join(allowed_transitions[current_state])
-                                        })
-
-                # Field updates - both setting and clearing
-                if new_state == 'completed':
-                    tracking_updates[record.id] = {
-                        # No specific user tracking for completed state
-                        # as it's automatically set via bill summary
-                    }
-                elif new_state == 'checked':
-                    tracking_updates[record.id] = {
-                        'checked_by': self.env.user.id,
-                        'checked_date': fields.Datetime.now(),
-                        'approved_by': False,
-                        'approved_date': False,
-                        'confirmed_by': False,  # Clear if reverting
-                        'confirmed_date': False,
-                        'audited_by': False,
-                        'audited_date': False,
-                        'paid_by': False,
-                        'paid_date': False
-                    }
-                elif new_state == 'approved':
-                    tracking_updates[record.id] = {
-                        'approved_by': self.env.user.id,
-                        'approved_date': fields.Datetime.now(),
-                        'confirmed_by': False,  # Clear if reverting
-                        'confirmed_date': False,
-                        'audited_by': False,
-                        'audited_date': False,
-                        'paid_by': False,
-                        'paid_date': False
-                    }
-                elif new_state == 'confirmed':
-                    tracking_updates[record.id] = {
-                        'confirmed_by': self.env.user.id,
-                        'confirmed_date': fields.Datetime.now(),
-                        'audited_by': False,
-                        'audited_date': False
-                    }
-                elif new_state == 'audited':
-                    tracking_updates[record.id] = {
-                        'audited_by': self.env.user.id,
-                        'audited_date': fields.Datetime.now()
-                    }
-                elif new_state == 'paid':
-                    tracking_updates[record.id] = {
-                        'paid_by': self.env.user.id,
-                        'paid_date': fields.Datetime.now()
-                    }
-                elif new_state == 'billed' and current_state == 'confirmed':
-                    # Special handling for revert - clear confirmation fields
-                    tracking_updates[record.id] = {
-                        'confirmed_by': False,
-                        'confirmed_date': False,
-                        'audited_by': False,
-                        'audited_date': False,
-                        'paid_by': False,
-                        'paid_date': False
-                    }
-                elif new_state == 'draft' and current_state == 'checked':
-                    tracking_updates[record.id] = {
-                        'checked_by': False,
-                        'checked_date': False
-                    }
-
-            # Apply tracking updates
-            for rec_id, updates in tracking_updates.items():
-                rec = self.browse(rec_id)
-                rec.write(updates)
-
-        # Execute the main write operation
-        result = super().write(vals)
+                record_ids_by_state[current_states[record.id]].append(record.id)
+            now = fields.Datetime.now()
+            result = True
+            for current_state, record_ids in record_ids_by_state.items():
+                tracking_values = self._get_state_tracking_values(current_state, new_state, now)
+                result = super(CommissionRecords, self.browse(record_ids)).write({**tracking_values, **vals})
+        else:
+            # Execute the main write operation
+            result = super().write(vals)
 
         if 'agent_id' in vals:
             for record in self:
@@ -555,6 +624,35 @@ class CommissionRecords(models.Model):
                 return True
         return False
 
+    def _auto_assign_to_worksheets(self):
+        """Batch version of _auto_assign_to_worksheet: one worksheet search for
+        all the records and one write per worksheet."""
+        records = self.filtered('agent_id')
+        if not records:
+            return
+        today = fields.Date.context_today(self)
+        ref_dates = {record: record.invoice_date or today for record in records}
+        candidates = self.env['commission_system.worksheet'].search([
+            ('agent_id', 'in', records.agent_id.ids),
+            ('state', 'in', list(set(records.mapped('state')))),
+            ('start_date', '<=', max(ref_dates.values())),
+            ('end_date', '>=', min(ref_dates.values())),
+        ])
+        worksheets_by_key = defaultdict(list)
+        for worksheet in candidates:
+            worksheets_by_key[worksheet.agent_id, worksheet.state].append(worksheet)
+        to_assign = defaultdict(list)
+        for record, ref_date in ref_dates.items():
+            worksheet = next((
+                worksheet for worksheet in worksheets_by_key[record.agent_id, record.state]
+                if worksheet.start_date <= ref_date <= worksheet.end_date
+            ), None)
+            if worksheet and record.worksheet_id != worksheet:
+                to_assign[worksheet].append(record.id)
+        for worksheet, record_ids in to_assign.items():
+            self.browse(record_ids).write({'worksheet_id': worksheet.id})
+            _logger.info("Auto-assigned records %s to worksheet %s", record_ids, worksheet.id)
+
     def get_approved_records_for_agent(self, agent_id, start_date=None, end_date=None):
         """Returns approved commission records for a specific agent"""
         domain = [
@@ -1940,28 +2038,37 @@ class CommissionBill(models.Model):
                 'date_billed': fields.Datetime.now()
             })
 
-            # Process records in batches to avoid state transition errors
-            for record in records:
-                try:
-                    record.write({
-                        'bill_id': self.id,
-                        'state': 'billed'
-                    })
-                except Exception as e:
-                    _logger.warning(f"Failed to update record {record.id}: {str(e)}")
-                    continue
-
-            # Sync any affected worksheets
-            worksheets = records.mapped('worksheet_id').filtered(lambda w: w.state == 'approved')
-            for worksheet in worksheets:
-                try:
-                    worksheet._sync_lines()
-                except Exception as e:
-                    _logger.error(f"Failed to sync worksheet {worksheet.id}: {str(e)}")
-
+            self._bill_commission_records(records, 'billed')
             return True
         return False
 
+    def _bill_commission_records(self, records, target_state):
+        """Link ``records`` to the bill and move them to ``target_state``.
+
+        The transitions are validated in memory and the records that cannot
+        make it are left out, so the valid ones are written at once and the
+        affected worksheets synced once.
+
+        :return: ``{record id: error message}`` of the records left out
+        """
+        self.ensure_one()
+        errors = records._get_state_change_errors(target_state)
+        for record_id, error in errors.items():
+            _logger.warning("Failed to update record %s: %s", record_id, error)
+
+        valid_records = records.filtered(lambda r: r.id not in errors)
+        if valid_records:
+            valid_records.write({
+                'bill_id': self.id,
+                'state': target_state
+            })
+
+        # Sync any affected worksheets
+        worksheets = records.mapped('worksheet_id').filtered(lambda w: w.state == 'approved')
+        if worksheets:
+            worksheets._sync_lines()
+        return errors
+
     def _generate_bill_name(self, vals):
         """Generate structured bill name: AgentName/YYYY-MM-DD-YYYY-MM-DD with duplicate handling"""
         agent = self.env['res.partner'].browse(vals.get('agent_id'))
@@ -2211,15 +2318,8 @@ class CommissionBill(models.Model):
                     # Link bills to summary
                     paid_bills.write({'summary_id': summary.id})
 
-                    # Update state to completed
-                    paid_bills.write({'state': self.COMPLETED})
-
-                    # Update commission records and lines
-                    for paid_bill in paid_bills:
-                        if paid_bill.commission_records:
-                            paid_bill.commission_records.write({'state': 'completed'})
-                        if paid_bill.line_ids:
-                            paid_bill.line_ids.write({'state': 'completed'})
+                    # Update state, commission records and lines to completed
+                    paid_bills._complete_bills()
 
                     summary._compute_totals()
 
@@ -2272,7 +2372,10 @@ class CommissionBill(models.Model):
 
         _logger.info("Grouped into %d agent-month combinations", len(bills_by_agent_month))
 
-        # Process each group
+        # Prepare the summaries of all the groups
+        groups = []
+        base_names = []
+        vals_list = []
         for (agent_id, month_start), bills in bills_by_agent_month.items():
             next_month = month_start.replace(month=month_start.month % 12 + 1,
                                              year=month_start.year + (month_start.month // 12))
@@ -2281,58 +2384,78 @@ class CommissionBill(models.Model):
             _logger.info("Processing agent %s, month %s to %s with %d bills",
                          bills[0].agent_id.name, month_start, month_end, len(bills))
 
-            # Create the summary
-            summary = self._create_monthly_summary(bills, month_start, month_end)
-            if not summary:
-                _logger.error("Failed to create summary for agent %s, month %s",
-                              bills[0].agent_id.name, month_start)
-                continue
+            base_name, vals = self._prepare_monthly_summary_vals(bills, month_start, month_end)
+            groups.append((bills, month_start, month_end))
+            base_names.append(base_name)
+            vals_list.append(vals)
+
+        # Create them in one batch, names deduplicated with a single query.
+        # The batch runs in a savepoint: when one agent-month fails (e.g. its
+        # records refuse to complete), it is rolled back and the summaries
+        # are created group by group, so the failing groups are only logged
+        # and skipped like before.
+        Summary = self.env['commission_system.bill.summary']
+        for vals, summary_name in zip(vals_list, Summary._get_unique_names(base_names)):
+            vals['name'] = summary_name
+        try:
+            with self.env.cr.savepoint():
+                summaries = Summary.create(vals_list)
+        except Exception as e:
+            _logger.warning("Batch summary creation failed (%s), creating the summaries one by one", e)
+            summaries = Summary
+            for bills, month_start, month_end in groups:
+                summary = self._create_monthly_summary(bills, month_start, month_end)
+                if not summary:
+                    _logger.error("Failed to create summary for agent %s, month %s",
+                                  bills[0].agent_id.name, month_start)
+                    continue
+                summaries |= summary
 
+        for summary in summaries:
             _logger.info("Created summary: %s (ID: %s)", summary.name, summary.id)
 
-            # The state update now happens in the summary's _auto_assign_bills method
-            # which is called automatically after summary creation
+        # The state update now happens in the summary's _auto_assign_bills method
+        # which is called automatically after summary creation
 
         _logger.info("=== MONTHLY SUMMARY GENERATION COMPLETE ===")
 
+    def _prepare_monthly_summary_vals(self, bills, month_start, month_end):
+        """Base name and create values of the monthly summary of ``bills``,
+        the unique name is given by the summary's ``_get_unique_names``"""
+        # Generate base name using the first bill's agent
+        agent = bills[0].agent_id if bills else None
+        agent_name = agent.name if agent else "Multiple"
+
+        start_str = month_start.strftime('%Y-%m-%d')
+        end_str = month_end.strftime('%Y-%m-%d')
+        base_name = f"Bill-Summary-{agent_name}-{start_str}-{end_str}"
+
+        return base_name, {
+            'date_range': f"{start_str} to {end_str}",
+            'start_date': month_start,
+            'end_date': month_end,
+            'generated_by': self.env.user.id,
+        }
+
     def _create_monthly_summary(self, bills, month_start, month_end):
         """Create a monthly bill summary - enhanced version"""
         try:
             _logger.info("Creating summary for %d bills, period %s to %s",
                          len(bills), month_start, month_end)
 
-            # Generate base name using the first bill's agent
-            agent = bills[0].agent_id if bills else None
-            if not agent:
+            if not bills or not bills[0].agent_id:
                 _logger.error("No agent found for bills")
                 return False
 
-            agent_name = agent.name if agent else "Multiple"
+            Summary = self.env['commission_system.bill.summary']
+            base_name, vals = self._prepare_monthly_summary_vals(bills, month_start, month_end)
+            vals['name'] = Summary._get_unique_names([base_name])[0]
 
-            start_str = month_start.strftime('%Y-%m-%d')
-            end_str = month_end.strftime('%Y-%m-%d')
-            base_name = f"Bill-Summary-{agent_name}-{start_str}-{end_str}"
+            _logger.info("Creating summary with name: %s", vals['name'])
 
-            # Check for existing summaries with same name
-            existing_count = self.env['commission_system.bill.summary'].search_count([
-                ('name', '=like', f"{base_name}%")
-            ])
-
-            if existing_count:
-                summary_name = f"{base_name}-{existing_count + 1}"
-            else:
-                summary_name = base_name
-
-            _logger.info("Creating summary with name: %s", summary_name)
-
-            # Create the summary
-            summary = self.env['commission_system.bill.summary'].create({
-                'name': summary_name,
-                'date_range': f"{start_str} to {end_str}",
-                'start_date': month_start,
-                'end_date': month_end,
-                'generated_by': self.env.user.id,
-            })
+            # Create the summary, rolled back on its own if it fails
+            with self.env.cr.savepoint():
+                summary = Summary.create(vals)
 
             _logger.info("Summary created successfully: %s (ID: %s)", summary.name, summary.id)
             return summary
@@ -2669,24 +2792,7 @@ class CommissionBill(models.Model):
 
         records = self.env['commission_system.records'].search(domain)
         if records:
-            # Process records individually to handle state transitions
-            for record in records:
-                try:
-                    record.write({
-                        'bill_id': original_bill.id,
-                        'state': original_bill.state
-                    })
-                except Exception as e:
-                    _logger.warning(f"Failed to update record {record.id} during merge: {str(e)}")
-                    continue
-
-            # Sync worksheets
-            worksheets = records.mapped('worksheet_id').filtered(lambda w: w.state == 'approved')
-            for worksheet in worksheets:
-                try:
-                    worksheet._sync_lines()
-                except Exception as e:
-                    _logger.error(f"Failed to sync worksheet {worksheet.id}: {str(e)}")
+            original_bill._bill_commission_records(records, original_bill.state)
 
         original_bill.message_post(body=_(
             "Merged with new bill for period %(start)s to %(end)s. "
@@ -2728,20 +2834,25 @@ class CommissionBill(models.Model):
             self.DRAFT: 'approved'
         }
 
+        # Bills sharing a state share their target state: sync them together
+        bill_ids_by_state = defaultdict(list)
         for bill in self:
-            target_state = state_mapping.get(bill.state)
-            if not target_state:
-                continue
+            if bill.state in state_mapping:
+                bill_ids_by_state[bill.state].append(bill.id)
+
+        for state, bill_ids in bill_ids_by_state.items():
+            target_state = state_mapping[state]
+            bills = self.browse(bill_ids)
 
             # Use force context when reverting
-            force = bill.state == self.BILLED and \
+            force = state == self.BILLED and \
                     self._context.get('reverting', False)
 
             ctx = {'force_state_change': True} if force else {}
 
             # Process worksheets
             worksheets = self.env['commission_system.worksheet'].with_context(**ctx).search([
-                ('commission_line_ids.bill_id', '=', bill.id)
+                ('commission_line_ids.bill_id', 'in', bills.ids)
             ])
             if worksheets:
                 worksheets.write({'state': target_state})
@@ -2752,11 +2863,29 @@ class CommissionBill(models.Model):
                 })
 
             # Handle orphaned records
-            bill.commission_records.filtered(
+            orphan_records = bills.commission_records.filtered(
                 lambda r: not r.worksheet_id
-            ).with_context(**ctx).write({
-                'state': target_state
-            })
+            )
+            if orphan_records:
+                orphan_records.with_context(**ctx).write({
+                    'state': target_state
+                })
+
+    def _complete_bills(self):
+        """Complete the bills with their worksheets, commission records and
+        lines, one write per model whatever the number of bills"""
+        bills = self.filtered(lambda b: b.state != self.COMPLETED)
+        if bills:
+            # The state sync completes the worksheets and their records
+            bills.write({'state': self.COMPLETED})
+
+        records = self.commission_records.filtered(lambda r: r.state != 'completed')
+        if records:
+            records.write({'state': 'completed'})
+
+        lines = self.line_ids.filtered(lambda l: l.state != 'completed')
+        if lines:
+            lines.write({'state': 'completed'})
 
     def action_revert_to_billed(self):
         """Complete revert solution with full synchronization"""
@@ -3802,85 +3931,98 @@ class CommissionBillSummary(models.Model):
                 summary.date_range = False
 
     def _auto_assign_bills(self):
-        """Automatically find and assign bills to this summary based on date range AND update their state"""
-        for summary in self:
-            _logger.info("=== Auto-assigning bills for summary: %s ===", summary.name)
+        """Automatically find and assign bills to these summaries based on date range AND update their state"""
+        if not self:
+            return
 
-            # Find bills that match the summary date range and are paid
-            domain = [
-                ('state', '=', 'paid'),
-                ('summary_id', '=', False),
-                ('start_date', '>=', summary.start_date),
-                ('start_date', '<=', summary.end_date),
-            ]
+        # Find the paid bills of all the date ranges at once
+        bills = self.env['commission_system.bill'].search([
+            ('state', '=', 'paid'),
+            ('summary_id', '=', False),
+            ('start_date', '>=', min(self.mapped('start_date'))),
+            ('start_date', '<=', max(self.mapped('end_date'))),
+        ])
 
-            bills_to_link = self.env['commission_system.bill'].search(domain)
-            _logger.info("Found %d bills to link", len(bills_to_link))
+        # A bill goes to the first summary whose date range contains it
+        bill_ids_by_summary = defaultdict(list)
+        for bill in bills:
+            summary = next((
+                summary for summary in self
+                if summary.start_date <= bill.start_date <= summary.end_date
+            ), None)
+            if summary:
+                bill_ids_by_summary[summary].append(bill.id)
+
+        for summary, bill_ids in bill_ids_by_summary.items():
+            self.env['commission_system.bill'].browse(bill_ids).write({'summary_id': summary.id})
+            _logger.info("Auto-assigned %d bills to summary %s", len(bill_ids), summary.name)
+
+        bills_to_link = self.env['commission_system.bill'].browse(
+            [bill_id for bill_ids in bill_ids_by_summary.values() for bill_id in bill_ids]
+        )
+        if bills_to_link:
+            # Update bills, commission records and lines to completed state
+            bills_to_link._complete_bills()
 
-            if bills_to_link:
-                # Update bills - link to summary AND change state in one operation
-                bills_to_link.write({
-                    'summary_id': summary.id,
-                    'state': 'completed'
-                })
+            _logger.info("Updated %d bills, %d commission records and %d commission lines to completed state",
+                         len(bills_to_link), len(bills_to_link.commission_records), len(bills_to_link.line_ids))
 
-                _logger.info("Auto-assigned %d bills to summary %s and updated state to completed",
-                             len(bills_to_link), summary.name)
-
-                # Also update all commission records to 'completed' state
-                record_count = 0
-                line_count = 0
-                for bill in bills_to_link:
-                    # Update commission records
-                    if bill.commission_records:
-                        bill.commission_records.write({
-                            'state': 'completed'
-                        })
-                        record_count += len(bill.commission_records)
-
-                    # Update commission lines
-                    if bill.line_ids:
-                        bill.line_ids.write({
-                            'state': 'completed'
-                        })
-                        line_count += len(bill.line_ids)
-
-                _logger.info("Updated %d commission records and %d commission lines to completed state",
-                             record_count, line_count)
-
-                # Force recompute of totals
-                summary._compute_totals()
+            # Force recompute of totals
+            self._compute_totals()
 
     @api.model
-    def create(self, vals):
-        """Override create to generate unique name if not provided"""
-        if vals.get('name', _('New')) == _('New'):
-            # Generate name based on date range
-            if vals.get('start_date') and vals.get('end_date'):
-                start_date = fields.Date.from_string(vals.get('start_date'))
-                end_date = fields.Date.from_string(vals.get('end_date'))
-                date_range = f"{start_date.strftime('%Y-%m-%d')}-{end_date.strftime('%Y-%m-%d')}"
-                base_name = f"Bill-Summary-{date_range}"
-
-                # Check for duplicates
-                existing_count = self.search_count([('name', '=like', f"{base_name}%")])
-                if existing_count:
-                    vals['name'] = f"{base_name}-{existing_count + 1}"
+    def _get_unique_names(self, base_names):
+        """Unique summary name for each of ``base_names``: the base name when
+        it is free, suffixed with the next number otherwise. The existing
+        names are read with a single query."""
+        if not base_names:
+            return []
+
+        existing_names = self.search(expression.OR([
+            [('name', '=like', f"{base_name}%")] for base_name in set(base_names)
+        ])).mapped('name')
+        counts = {
+            base_name: sum(1 for name in existing_names if name.startswith(base_name))
+            for base_name in set(base_names)
+        }
+
+        names = []
+        for base_name in base_names:
+            names.append(f"{base_name}-{counts[base_name] + 1}" if counts[base_name] else base_name)
+            counts[base_name] += 1
+        return names
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to generate unique names if not provided"""
+        to_name = []
+        for vals in vals_list:
+            if vals.get('name', _('New')) == _('New'):
+                # Generate name based on date range
+                if vals.get('start_date') and vals.get('end_date'):
+                    start_date = fields.Date.from_string(vals.get('start_date'))
+                    end_date = fields.Date.from_string(vals.get('end_date'))
+                    date_range = f"{start_date.strftime('%Y-%m-%d')}-{end_date.strftime('%Y-%m-%d')}"
+                    to_name.append((vals, f"Bill-Summary-{date_range}"))
                 else:
-                    vals['name'] = base_name
-            else:
-                # Fallback name
-                vals['name'] = f"Bill-Summary-{fields.Datetime.now().strftime('%Y%m%d-%H%M%S')}"
+                    # Fallback name
+                    vals['name'] = f"Bill-Summary-{fields.Datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+        # Check for duplicates
+        names = self._get_unique_names([base_name for _vals, base_name in to_name])
+        for (vals, _base_name), name in zip(to_name, names):
+            vals['name'] = name
 
-        summary = super().create(vals)
+        summaries = super().create(vals_list)
 
         # Auto-assign bills after creation AND update their state
-        summary._auto_assign_bills()
+        summaries._auto_assign_bills()
 
-        summary.message_post(body=_(
-            "Bill summary created for period %s. Assigned %d bills and updated them to completed state."
-        ) % (summary.date_range, len(summary.bill_ids)))
-        return summary
+        for summary in summaries:
+            summary.message_post(body=_(
+                "Bill summary created for period %s. Assigned %d bills and updated them to completed state."
+            ) % (summary.date_range, len(summary.bill_ids)))
+        return summaries
 
     def action_view_bills(self):
         """View all bills included in this summary"""
@@ -4294,32 +4436,19 @@ class CommissionBillSummary(models.Model):
 
     def action_update_bill_states(self):
         """Manually update all bills in this summary to completed state"""
+        # Update bill states, commission records and lines to completed
+        self.bill_ids._complete_bills()
+
         for summary in self:
             if not summary.bill_ids:
                 _logger.info("No bills in summary %s", summary.name)
                 continue
 
-            _logger.info("Updating %d bills in summary %s to completed state",
-                         len(summary.bill_ids), summary.name)
-
-            # Update bill states to completed
-            summary.bill_ids.write({
-                'state': 'completed'
-            })
-
-            # Update commission records and lines
-            record_count = 0
-            line_count = 0
-            for bill in summary.bill_ids:
-                if bill.commission_records:
-                    bill.commission_records.write({'state': 'completed'})
-                    record_count += len(bill.commission_records)
-                if bill.line_ids:
-                    bill.line_ids.write({'state': 'completed'})
-                    line_count += len(bill.line_ids)
+            record_count = len(summary.bill_ids.commission_records)
+            line_count = len(summary.bill_ids.line_ids)
 
-            _logger.info("Updated %d bills, %d records, %d lines to completed state",
-                         len(summary.bill_ids), record_count, line_count)
+            _logger.info("Updated %d bills, %d records, %d lines of summary %s to completed state",
+                         len(summary.bill_ids), record_count, line_count, summary.name)
 
             summary.message_post(body=_(
                 "Manually updated %d bills and their commission records (%d records, %d lines) to completed state."
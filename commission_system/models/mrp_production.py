@@ -241,6 +241,12 @@ class MrpProduction(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         """Override create to modify component quantities based on custom fields"""
+        # Match the origins with sale order names in one search
+        origins = {vals['origin'] for vals in vals_list if not vals.get('sale_order_id') and vals.get('origin')}
+        orders_by_name = {}
+        if origins:
+            for order in self.env['sale.order'].search([('name', 'in', list(origins))]):
+                orders_by_name.setdefault(order.name, order)
         for vals in vals_list:
             # Try to detect from sale_order_id (explicit)
             sale_order = False
@@ -248,7 +254,7 @@ class MrpProduction(models.Model):
                 sale_order = self.env['sale.order'].browse(vals['sale_order_id'])
             elif vals.get('origin'):
                 # Try matching the origin with sale order name
-                sale_order = self.env['sale.order'].search([('name', '=', vals['origin'])], limit=1)
+                sale_order = orders_by_name.get(vals['origin'], False)
 
             # Assign location from Sale Order
             if sale_order and sale_order.location_id:
@@ -1,6 +1,7 @@
 from odoo import models, fields, api, _, SUPERUSER_ID
 from odoo.exceptions import ValidationError, UserError, AccessError
 import logging
+from collections import defaultdict
 import time  # Added for the time.sleep in _update_manufacturing_dimensions
 
 _logger = logging.getLogger(__name__)
@@ -232,42 +233,72 @@ class SaleOrder(models.Model):
 
     def _create_invoices(self, *args, **kwargs):
         """Create invoices from SO and copy bank payments"""
-        for order in self:
-            if order.is_credit and order.state in ['sale', 'done']:
-                for line in order.order_line.filtered(lambda l: not l.display_type):
-                    line.qty_to_invoice = line.product_uom_qty - line.qty_invoiced
+        self._set_credit_qty_to_invoice()
 
         invoices = super(SaleOrder, self)._create_invoices(*args, **kwargs)
-        
-        for order in self:
-            for inv in invoices:
-                # Copy SO bank payments into Invoice Bank Payment
+
+        # Copy SO bank payments into the Invoice Bank Payments of their own invoices
+        payment_vals_list = []
+        for inv in invoices:
+            for order in inv.line_ids.sale_line_ids.order_id & self:
                 for line in order.bank_account_payment_ids:
-                    self.env['account.move.bank.payment'].create({
+                    payment_vals_list.append({
                         'invoice_id': inv.id,
                         'bank_account_id': line.bank_account_id.id,
                         'tt_number': line.tt_number,
                         'amount': line.amount,
                     })
-        for order in self.filtered(lambda o: o.is_credit and o.state in ['sale', 'done']):
-            for line in order.order_line:
-                if line.product_uom_qty <= line.qty_invoiced:
-                    line.qty_to_invoice = 0
+        self.env['account.move.bank.payment'].create(payment_vals_list)
+
+        self._filter_credit_orders().order_line.filtered(
+            lambda l: l.qty_to_invoice and l.product_uom_qty <= l.qty_invoiced
+        ).write({'qty_to_invoice': 0})
 
         self._compute_invoice_status()
         return invoices
 
     def _compute_invoice_status(self):
-        for order in self:
-            if order.is_credit and order.state in ['sale', 'done']:
-                all_invoiced = all(
-                    line.qty_invoiced >= line.product_uom_qty
-                    for line in order.order_line
-                    if not line.display_type
-                )
-                order.invoice_status = 'invoiced' if all_invoiced else 'to invoice'
-            else:
-                super(SaleOrder, order)._compute_invoice_status()
+        credit_orders = self._filter_credit_orders()
+        super(SaleOrder, self - credit_orders)._compute_invoice_status()
+        # Orders being edited only exist in the cache
+        new_orders = credit_orders.filtered(lambda o: isinstance(o.id, models.NewId))
+        for order in new_orders:
+            all_invoiced = all(
+                line.qty_invoiced >= line.product_uom_qty
+                for line in order.order_line
+                if not line.display_type
+            )
+            order.invoice_status = 'invoiced' if all_invoiced else 'to invoice'
+        to_invoice_ids = (credit_orders - new_orders)._get_partially_invoiced_ids()
+        for order in credit_orders - new_orders:
+            order.invoice_status = 'to invoice' if order.id in to_invoice_ids else 'invoiced'
+
+    def _filter_credit_orders(self):
+        return self.filtered(lambda o: o.is_credit and o.state in ['sale', 'done'])
+
+    def _set_credit_qty_to_invoice(self):
+        """Make the whole ordered quantity of credit orders invoiceable, with
+        one write per quantity instead of one per line."""
+        lines = self._filter_credit_orders().order_line.filtered(lambda l: not l.display_type)
+        line_ids_by_qty = defaultdict(list)
+        for line in lines:
+            line_ids_by_qty[line.product_uom_qty - line.qty_invoiced].append(line.id)
+        for qty, line_ids in line_ids_by_qty.items():
+            lines.browse(line_ids).write({'qty_to_invoice': qty})
+
+    def _get_partially_invoiced_ids(self):
+        """Ids of the orders having a product line not fully invoiced."""
+        if not self:
+            return set()
+        self.env['sale.order.line'].flush_model(['order_id', 'display_type', 'product_uom_qty', 'qty_invoiced'])
+        self.env.cr.execute("""
+            SELECT DISTINCT order_id
+              FROM sale_order_line
+             WHERE order_id IN %s
+               AND display_type IS NULL
+               AND qty_invoiced < product_uom_qty
+        """, [tuple(self.ids)])
+        return {order_id for order_id, in self.env.cr.fetchall()}
 
     def debug_manufacturing_links_detailed(self):
         # ... (Your original debug method) ...
@@ -374,15 +405,15 @@ class SaleOrder(models.Model):
 
     def action_confirm(self):
 
-        restricted_group = self.env.ref('commission_system.group_restricted_users')
-        if self.env.user in restricted_group.users:
+        if self.env.user.has_group('commission_system.group_restricted_users'):
             raise UserError("You are not allowed to confirm quotations.")
 
         # 2. STANDARD ODOO CONFIRMATION & EXISTING LOGIC
         result = super(SaleOrder, self).action_confirm()
-        for order in self:
-            if order.is_credit:
-                self._create_invoices() 
+        # Invoice all the credit orders at once
+        credit_orders = self.filtered('is_credit')
+        if credit_orders:
+            credit_orders._create_invoices()
         # 3. CUSTOM LOGIC
         self._update_manufacturing_dimensions()
 
@@ -410,20 +441,26 @@ class SaleOrder(models.Model):
 
         # If the location_id was changed, update related manufacturing orders
         if 'location_id' in vals:
-            for order in self:
-                # Search by origin only, since sale_order_id doesn't exist on mrp.production
-                mo_list = self.env['mrp.production'].search([
-                    ('origin', '=', order.name)
-                ])
-
-                # Update only active (non-done/non-cancelled) MOs
-                if mo_list:
-                    mo_list.filtered(
-                        lambda m: m.state not in ['done', 'cancel']
-                    ).sudo().write({'location_id': order.location_id.id})
+            self._propagate_location_to_productions()
 
         return res
 
+    def _propagate_location_to_productions(self):
+        """Copy the location of the orders to their active manufacturing orders,
+        with one search for all the orders and one write per location."""
+        orders_by_name = {order.name: order for order in self}
+        # Search by origin only, since sale_order_id doesn't exist on mrp.production
+        # Update only active (non-done/non-cancelled) MOs
+        productions = self.env['mrp.production'].search([
+            ('origin', 'in', list(orders_by_name)),
+            ('state', 'not in', ['done', 'cancel']),
+        ])
+        productions_by_location = defaultdict(lambda: self.env['mrp.production'])
+        for production in productions:
+            productions_by_location[orders_by_name[production.origin].location_id.id] |= production
+        for location_id, location_productions in productions_by_location.items():
+            location_productions.sudo().write({'location_id': location_id})
+
 # Invoice Bank Payment
 
 
@@ -0,0 +1,70 @@
+"""Benchmark of the permission checks of a 1,000-record state change.
+
+Run from an Odoo shell of a database where commission_system is installed::
+
+    odoo-bin shell -d <db> < commission_system/scripts/state_change_benchmark.py
+
+The records are created in a savepoint that is rolled back at the end, so
+nothing is written to the database.
+"""
+import timeit
+
+from odoo.addons.commission_system.models.models import RECORD_STATE_TRANSITIONS
+
+RECORDS = 1000
+CHECK_GROUPS = [
+    'commission_system.group_commission_check',
+    'commission_system.group_commission_approve',
+    'commission_system.group_commission_confirm',
+    'commission_system.group_commission_audit',
+    'commission_system.group_commission_pay',
+]
+
+
+def check_records_loop(records, new_state):
+    """Previous checks of CommissionRecords.write, evaluated per record."""
+    env = records.env
+    user = env.user
+    groups = [env.ref(xmlid) for xmlid in CHECK_GROUPS]
+    group_by_state = dict(zip(['checked', 'approved', 'confirmed', 'audited', 'paid'], groups))
+    for record in records:
+        if record.state == new_state:
+            continue
+        group = group_by_state.get(new_state)
+        if group and user not in group.users:
+            raise AssertionError("missing group")
+        if new_state not in RECORD_STATE_TRANSITIONS.get(record.state, []):
+            raise AssertionError("invalid transition")
+
+
+def benchmark(env):
+    admin = env.ref('base.user_admin')
+    admin.write({'groups_id': [(4, env.ref(xmlid).id) for xmlid in CHECK_GROUPS]})
+    env = env(user=admin)
+    records = env['commission_system.records'].create([
+        {'name': 'Benchmark %s' % i, 'amount': 1.0} for i in range(RECORDS)
+    ])
+    assert not records._get_state_change_errors('checked')
+
+    for label, func in [
+        ("env.ref + group.users per record", lambda: check_records_loop(records, 'checked')),
+        ("cached has_group per write", lambda: records._get_state_change_errors('checked')),
+    ]:
+        runs = []
+        for _i in range(5):
+            # Drop the cached group users so every run reads them again
+            env.invalidate_all()
+            runs.append(timeit.timeit(func, number=1))
+        print("%-34s %8.3f ms per %d records" % (label, min(runs) * 1000, RECORDS))
+
+    start = timeit.default_timer()
+    records.write({'state': 'checked'})
+    env.flush_all()
+    print("%-34s %8.3f ms per %d records" % ("write draft -> checked", (timeit.default_timer() - start) * 1000, RECORDS))
+
+
+with env.cr.savepoint() as savepoint:
+    benchmark(env)
+    env.flush_all()
+    savepoint.rollback()
+env.invalidate_all()
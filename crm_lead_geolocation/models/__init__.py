@@ -1 +1,2 @@
+from . import geo_search_mixin
 from . import crm_lead
@@ -3,7 +3,7 @@ from email.policy import default
 from odoo import api ,models, fields
 
 class CrmLead(models.Model):
-    _inherit = 'crm.lead'
+    _inherit = ['crm.lead', 'geo.search.mixin']
 
     latitude = fields.Float("Latitude", digits=(16, 6))
     longitude = fields.Float("Longitude", digits=(16, 6))
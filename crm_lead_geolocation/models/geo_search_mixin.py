@@ -0,0 +1,123 @@
+import math
+
+from odoo import api, models
+from odoo.tools import SQL
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def geo_bbox(lat, lng, radius_km):
+    """Bounding box ``(south, north, west, east)`` enclosing the circle of
+    ``radius_km`` around (lat, lng); ``west > east`` when it crosses the
+    antimeridian, ``None`` longitudes when it covers every longitude."""
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    cos_lat = math.cos(math.radians(max(abs(south), abs(north))))
+    if cos_lat < 1e-6 or radius_km / (KM_PER_DEGREE_LAT * cos_lat) >= 180.0:
+        return south, north, None, None
+    dlng = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    west = (lng - dlng + 180.0) % 360.0 - 180.0
+    east = (lng + dlng + 180.0) % 360.0 - 180.0
+    return south, north, west, east
+
+
+def geo_bbox_sql(lat_col, lng_col, lat, lng, radius_km):
+    """Index-friendly range condition on the (lat, lng) B-tree."""
+    south, north, west, east = geo_bbox(lat, lng, radius_km)
+    condition = SQL("%s BETWEEN %s AND %s", lat_col, south, north)
+    if west is None:
+        return condition
+    if west <= east:
+        return SQL("%s AND %s BETWEEN %s AND %s", condition, lng_col, west, east)
+    return SQL("%s AND (%s >= %s OR %s <= %s)", condition, lng_col, west, lng_col, east)
+
+
+def geo_distance_sql(lat_col, lng_col, lat, lng):
+    """Great-circle (haversine) distance in km, computed by PostgreSQL."""
+    return SQL(
+        """(2 * %s * ASIN(LEAST(1, SQRT(
+                POWER(SIN(RADIANS(%s - %s) / 2), 2)
+                + COS(RADIANS(%s)) * COS(RADIANS(%s)) * POWER(SIN(RADIANS(%s - %s) / 2), 2)
+           ))))""",
+        EARTH_RADIUS_KM, lat_col, lat, lat, lat_col, lng_col, lng,
+    )
+
+
+class GeoSearchMixin(models.AbstractModel):
+    """Radius and nearest-neighbour search over ``latitude``/``longitude``.
+
+    Inheriting models get a composite B-tree index on (latitude, longitude),
+    kept up to date by PostgreSQL on every write. Searches first restrict
+    the candidates to the bounding box of the search circle through that
+    index, then compute the exact distance in SQL, so no extension beyond
+    stock PostgreSQL is required.
+    """
+    _name = 'geo.search.mixin'
+    _description = 'Geolocation Search Mixin'
+
+    _geo_lat_field = 'latitude'
+    _geo_lng_field = 'longitude'
+
+    def init(self):
+        super().init()
+        if self._abstract:
+            return
+        self.env.cr.execute(SQL(
+            "CREATE INDEX IF NOT EXISTS %s ON %s (%s, %s)",
+            SQL.identifier(f"{self._table}_geo_latlng_index"),
+            SQL.identifier(self._table),
+            SQL.identifier(self._geo_lat_field),
+            SQL.identifier(self._geo_lng_field),
+        ))
+
+    def _geo_query(self, domain, lat, lng, radius_km):
+        self.check_access_rights('read')
+        self.flush_model()
+        query = self._where_calc(domain or [])
+        self._apply_ir_rules(query, 'read')
+        lat_col = SQL.identifier(self._table, self._geo_lat_field)
+        lng_col = SQL.identifier(self._table, self._geo_lng_field)
+        # Records never geocoded keep 0.0 in both coordinates
+        query.add_where(SQL("(%s != 0 OR %s != 0)", lat_col, lng_col))
+        query.add_where(geo_bbox_sql(lat_col, lng_col, lat, lng, radius_km))
+        return query, geo_distance_sql(lat_col, lng_col, lat, lng)
+
+    def _geo_fetch(self, domain, lat, lng, radius_km, limit=None):
+        query, distance = self._geo_query(domain, lat, lng, radius_km)
+        self.env.cr.execute(SQL(
+            """SELECT * FROM (SELECT %s AS id, %s AS distance FROM %s WHERE %s) AS candidates
+                WHERE distance <= %s ORDER BY distance, id %s""",
+            SQL.identifier(self._table, 'id'), distance,
+            query.from_clause, query.where_clause,
+            radius_km, SQL("LIMIT %s", limit) if limit else SQL(),
+        ))
+        return self.env.cr.fetchall()
+
+    @api.model
+    def geo_search_radius(self, lat, lng, radius_km, domain=None, limit=None):
+        """Records within ``radius_km`` of (lat, lng), nearest first.
+
+        :return: recordset; the distances (km) are available through
+            :meth:`geo_search_radius_distances`
+        """
+        return self.browse(row[0] for row in self._geo_fetch(domain, lat, lng, radius_km, limit))
+
+    @api.model
+    def geo_search_radius_distances(self, lat, lng, radius_km, domain=None, limit=None):
+        """Same as :meth:`geo_search_radius`, as a list of ``(id, distance_km)``."""
+        return self._geo_fetch(domain, lat, lng, radius_km, limit)
+
+    @api.model
+    def geo_search_nearest(self, lat, lng, k=10, domain=None, max_radius_km=EARTH_RADIUS_KM * math.pi):
+        """The ``k`` records nearest to (lat, lng), nearest first.
+
+        The search circle starts at 1 km and grows until it holds ``k``
+        records, so each round stays an index range scan.
+        """
+        radius_km = 1.0
+        while True:
+            rows = self._geo_fetch(domain, lat, lng, radius_km, k)
+            if len(rows) >= k or radius_km >= max_radius_km:
+                return self.browse(row[0] for row in rows)
+            radius_km = min(radius_km * (4 if not rows else 2), max_radius_km)
@@ -0,0 +1,99 @@
+"""Benchmark of the geo.search.mixin queries on synthetic data.
+
+Run from an Odoo shell of a database where crm_lead_geolocation is installed::
+
+    odoo-bin shell -d <db> < crm_lead_geolocation/scripts/geo_search_benchmark.py
+
+The points live in a temporary table, so nothing is written to the database.
+Each query shape is timed with and without the (latitude, longitude) index.
+"""
+import random
+import time
+
+from odoo.tools import SQL
+
+from odoo.addons.crm_lead_geolocation.models.geo_search_mixin import geo_bbox_sql, geo_distance_sql
+
+POINTS = 1_000_000
+QUERIES = 200
+# Points spread over a region roughly the size of Ethiopia
+LAT_RANGE = (3.0, 15.0)
+LNG_RANGE = (33.0, 48.0)
+
+
+def setup(cr):
+    cr.execute("DROP TABLE IF EXISTS geo_benchmark")
+    cr.execute("""
+        CREATE TEMPORARY TABLE geo_benchmark AS
+        SELECT id,
+               %s + random() * %s AS latitude,
+               %s + random() * %s AS longitude
+          FROM generate_series(1, %s) AS id
+    """, (LAT_RANGE[0], LAT_RANGE[1] - LAT_RANGE[0], LNG_RANGE[0], LNG_RANGE[1] - LNG_RANGE[0], POINTS))
+    cr.execute("ANALYZE geo_benchmark")
+
+
+def radius_query(lat, lng, radius_km, limit=None):
+    lat_col, lng_col = SQL.identifier('latitude'), SQL.identifier('longitude')
+    return SQL(
+        """SELECT * FROM (SELECT id, %s AS distance FROM geo_benchmark WHERE %s) AS candidates
+            WHERE distance <= %s ORDER BY distance, id %s""",
+        geo_distance_sql(lat_col, lng_col, lat, lng),
+        geo_bbox_sql(lat_col, lng_col, lat, lng, radius_km),
+        radius_km, SQL("LIMIT %s", limit) if limit else SQL(),
+    )
+
+
+def nearest(cr, lat, lng, k):
+    radius_km = 1.0
+    while True:
+        cr.execute(radius_query(lat, lng, radius_km, k))
+        rows = cr.fetchall()
+        if len(rows) >= k:
+            return rows
+        radius_km *= 4 if not rows else 2
+
+
+def run(cr, label, func):
+    rnd = random.Random(42)
+    timings = []
+    for _i in range(QUERIES):
+        lat, lng = rnd.uniform(*LAT_RANGE), rnd.uniform(*LNG_RANGE)
+        start = time.perf_counter()
+        func(cr, lat, lng)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print("%-32s p50 %8.2f ms   p95 %8.2f ms" % (
+        label, timings[len(timings) // 2] * 1000, timings[int(len(timings) * 0.95)] * 1000,
+    ))
+
+
+def radius(radius_km):
+    def func(cr, lat, lng):
+        cr.execute(radius_query(lat, lng, radius_km))
+        cr.fetchall()
+    return func
+
+
+def benchmark(cr):
+    setup(cr)
+    cases = [
+        ("radius 1 km", radius(1)),
+        ("radius 5 km", radius(5)),
+        ("radius 25 km", radius(25)),
+        ("nearest 10", lambda cr, lat, lng: nearest(cr, lat, lng, 10)),
+    ]
+    print("%d points, %d queries per case" % (POINTS, QUERIES))
+    print("-- sequential scan")
+    for label, func in cases:
+        run(cr, label, func)
+    cr.execute("CREATE INDEX geo_benchmark_latlng_index ON geo_benchmark (latitude, longitude)")
+    cr.execute("ANALYZE geo_benchmark")
+    print("-- (latitude, longitude) index")
+    for label, func in cases:
+        run(cr, label, func)
+    cr.execute("DROP TABLE geo_benchmark")
+
+
+benchmark(env.cr)  # noqa: F821 (provided by odoo-bin shell)
+env.cr.rollback()  # noqa: F821
@@ -2,9 +2,15 @@
 # Copyright 2017 Tecnativa - Vicent Cubells
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from functools import reduce
+from collections import defaultdict
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
+
+# Fields aggregated by the monthly phone call report
+MONTHLY_REPORT_FIELDS = {
+    "user_id", "team_id", "company_id", "state", "duration",
+    "date_open", "date_closed",
+}
 
 
 class CrmPhonecall(models.Model):
@@ -66,6 +72,18 @@ class CrmPhonecall(models.Model):
         default="1",
     )
     date_closed = fields.Datetime(string="Closed", readonly=True)
+    delay_open = fields.Float(
+        string="Delay to open",
+        compute="_compute_delays",
+        store=True,
+        help="Number of days between the creation and the opening of the call",
+    )
+    delay_close = fields.Float(
+        string="Delay to close",
+        compute="_compute_delays",
+        store=True,
+        help="Number of days between the creation and the closing of the call",
+    )
     date = fields.Datetime(default=lambda self: fields.Datetime.now())
     opportunity_id = fields.Many2one(comodel_name="crm.lead", string="Lead/Opportunity")
     direction = fields.Selection(
@@ -92,6 +110,33 @@ class CrmPhonecall(models.Model):
         readonly=True,
     )
 
+    def init(self):
+        """Composite indexes used by the phone call reports."""
+        super().init()
+        for indexname, expressions in [
+            ("crm_phonecall_team_id_create_date_index", ["team_id", "create_date"]),
+            ("crm_phonecall_user_id_create_date_index", ["user_id", "create_date"]),
+            ("crm_phonecall_create_date_index", ["create_date"]),
+        ]:
+            tools.create_index(self.env.cr, indexname, self._table, expressions)
+
+    @api.depends("create_date", "date_open", "date_closed")
+    def _compute_delays(self):
+        """Delays in days, stored when the call is opened or closed so the
+        reports do not compute them per row at query time."""
+        for call in self:
+            create_date = call.create_date
+            call.delay_open = (
+                (call.date_open - create_date).total_seconds() / 86400
+                if create_date and call.date_open
+                else 0.0
+            )
+            call.delay_close = (
+                (call.date_closed - create_date).total_seconds() / 86400
+                if create_date and call.date_closed
+                else 0.0
+            )
+
     # --- Compute overall score ---
     @api.depends(
         "name_confirmed",
@@ -114,27 +159,46 @@ class CrmPhonecall(models.Model):
             rec.overall_score = (confirmed_count / len(fields_to_check)) * 100 if fields_to_check else 0
 
     # --- Auto-create telemarketing.confirmation when phonecall is created ---
-    @api.model
-    def create(self, vals):
-        record = super().create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._create_telemarketing_confirmations()
+        self.env["crm.phonecall.report.monthly"]._schedule_refresh(
+            records.mapped("create_date")
+        )
+        return records
 
-        if record.opportunity_id:
-            confirmation_vals = {
-                "lead_id": record.opportunity_id.id,
-                "telemarketer_id": record.opportunity_id.user_id.id,
-                "phonecall_id": record.id,
-                "name_confirmed": record.name_confirmed,
-                "address_confirmed": record.address_confirmed,
-                "phone_confirmed": record.phone_confirmed,
-                "service_satisfaction_confirmed": record.service_satisfaction_confirmed,
-                "product_information_confirmed": record.product_information_confirmed,
+    def _create_telemarketing_confirmations(self):
+        """Create the confirmations of the calls linked to an opportunity in
+        one batch, and link them back to their call with a single UPDATE."""
+        calls = self.filtered("opportunity_id")
+        if not calls:
+            return
+        # The confirmation batch reserves its sequence numbers as one block
+        # and schedules the KPI update once per user
+        confirmations = self.env["telemarketing.confirmation"].create([
+            {
+                "lead_id": call.opportunity_id.id,
+                "telemarketer_id": call.opportunity_id.user_id.id,
+                "phonecall_id": call.id,
+                "name_confirmed": call.name_confirmed,
+                "address_confirmed": call.address_confirmed,
+                "phone_confirmed": call.phone_confirmed,
+                "service_satisfaction_confirmed": call.service_satisfaction_confirmed,
+                "product_information_confirmed": call.product_information_confirmed,
             }
-
-            # Create the confirmation record (this triggers KPI + sequence + scoring logic)
-            confirmation = self.env["telemarketing.confirmation"].create(confirmation_vals)
-            record.confirmation_id = confirmation.id
-
-        return record
+            for call in calls
+        ])
+        confirmations.flush_recordset(["phonecall_id"])
+        self.env.cr.execute(
+            """UPDATE crm_phonecall call
+                  SET confirmation_id = confirmation.id
+                 FROM telemarketing_confirmation confirmation
+                WHERE confirmation.phonecall_id = call.id
+                  AND confirmation.id IN %s""",
+            (tuple(confirmations.ids),),
+        )
+        calls.invalidate_recordset(["confirmation_id"])
 
     @api.onchange("partner_id")
     def _onchange_partner_id(self):
@@ -162,20 +226,35 @@ class CrmPhonecall(models.Model):
             elif values.get("state") == "open":
                 values["date_open"] = fields.Datetime.now()
                 values["duration"] = 0.0
-        return super().write(values)
+        res = super().write(values)
+        if MONTHLY_REPORT_FIELDS.intersection(values):
+            self.env["crm.phonecall.report.monthly"]._schedule_refresh(
+                self.mapped("create_date")
+            )
+        return res
+
+    def unlink(self):
+        self.env["crm.phonecall.report.monthly"]._schedule_refresh(
+            self.mapped("create_date")
+        )
+        return super().unlink()
 
     def compute_duration(self):
-        """Calculate duration based on phonecall date."""
-        phonecall_dates = self.filtered("date")
-        phonecall_no_dates = self - phonecall_dates
-        for phonecall in phonecall_dates:
+        """Calculate duration based on phonecall date.
+
+        Calls are grouped by resulting duration, so each distinct value is
+        written once for all the calls sharing it.
+        """
+        now = fields.Datetime.now()
+        call_ids_by_duration = defaultdict(list)
+        for phonecall in self:
             if phonecall.duration <= 0 and phonecall.date:
-                duration = fields.Datetime.now() - phonecall.date
-                values = {"duration": duration.seconds / 60.0}
-                phonecall.write(values)
+                duration = (now - phonecall.date).seconds / 60.0
             else:
-                phonecall.duration = 0.0
-        phonecall_no_dates.write({"duration": 0.0})
+                duration = 0.0
+            call_ids_by_duration[duration].append(phonecall.id)
+        for duration, call_ids in call_ids_by_duration.items():
+            self.browse(call_ids).write({"duration": duration})
         return True
 
     def get_values_schedule_another_phonecall(self, vals):
@@ -199,18 +278,19 @@ class CrmPhonecall(models.Model):
         return res
 
     def schedule_another_phonecall(self, vals, return_recordset=False):
-        """Action :('schedule','Schedule a call'), ('log','Log a call')."""
-        phonecall_dict = {}
-        for call in self:
-            values = call.get_values_schedule_another_phonecall(vals)
-            new_id = self.create(values)
-            if vals.get("action") == "log":
-                call.write({"state": "done"})
-            phonecall_dict[call.id] = new_id
+        """Action :('schedule','Schedule a call'), ('log','Log a call').
+
+        All follow-up calls are created with a single ``create``; when
+        logging, the original calls are closed with a single ``write``.
+        """
+        new_calls = self.create(
+            [call.get_values_schedule_another_phonecall(vals) for call in self]
+        )
+        if vals.get("action") == "log":
+            self.write({"state": "done"})
         if return_recordset:
-            return reduce(lambda x, y: x + y, phonecall_dict.values())
-        else:
-            return phonecall_dict
+            return new_calls
+        return dict(zip(self.ids, new_calls))
 
     def redirect_phonecall_view(self):
         """Redirect on the phonecall related view."""
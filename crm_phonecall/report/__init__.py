@@ -1 +1,2 @@
 from . import crm_phonecall_report
+from . import crm_phonecall_report_monthly
@@ -68,12 +68,10 @@ class CrmPhonecallReport(models.Model):
                 c.priority,
                 1 as nbr_cases,
                 c.create_date as create_date,
-                extract(
-                  'epoch' from (
-                  c.date_closed-c.create_date))/(3600*24) as delay_close,
-                extract(
-                  'epoch' from (
-                  c.date_open-c.create_date))/(3600*24) as delay_open
+                case when c.date_closed is not null
+                    then c.delay_close end as delay_close,
+                case when c.date_open is not null
+                    then c.delay_open end as delay_open
            """
         return select_str
 
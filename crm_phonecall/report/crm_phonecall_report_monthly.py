@@ -0,0 +1,165 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import logging
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+from .crm_phonecall_report import AVAILABLE_STATES
+
+_logger = logging.getLogger(__name__)
+
+# Months whose rows must be re-aggregated before the transaction commits
+REFRESH_MONTHS_KEY = "crm.phonecall.report.monthly.months"
+
+
+class CrmPhonecallReportMonthly(models.Model):
+    """Monthly rollup of phone calls.
+
+    ``crm_phonecall_report_monthly`` is a real table holding one row per
+    month, user, team, company and state. The months touched by a
+    transaction are re-aggregated once, right before it commits, so pivots
+    over several years read a handful of rows per month instead of every
+    call.
+    """
+
+    _name = "crm.phonecall.report.monthly"
+    _description = "Phone calls by month"
+    _auto = False
+    _rec_name = "month"
+    _order = "month desc"
+
+    month = fields.Date(readonly=True)
+    user_id = fields.Many2one(comodel_name="res.users", string="User", readonly=True)
+    team_id = fields.Many2one(comodel_name="crm.team", string="Team", readonly=True)
+    company_id = fields.Many2one(
+        comodel_name="res.company", string="Company", readonly=True
+    )
+    state = fields.Selection(AVAILABLE_STATES, string="Status", readonly=True)
+    nbr_cases = fields.Integer(string="# of Cases", readonly=True)
+    duration = fields.Float(string="Total Duration", digits=(16, 2), readonly=True)
+    nbr_opened = fields.Integer(string="# of Opened Cases", readonly=True)
+    delay_open = fields.Float(
+        string="Total Delay to open",
+        digits=(16, 2),
+        readonly=True,
+        help="Sum of the days to open the opened cases",
+    )
+    nbr_closed = fields.Integer(string="# of Closed Cases", readonly=True)
+    delay_close = fields.Float(
+        string="Total Delay to close",
+        digits=(16, 2),
+        readonly=True,
+        help="Sum of the days to close the closed cases",
+    )
+
+    def init(self):
+        cr = self.env.cr
+        cr.execute("SELECT 1 FROM pg_class WHERE relname = %s", (self._table,))
+        exists = cr.fetchone()
+        cr.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crm_phonecall_report_monthly (
+                id          SERIAL PRIMARY KEY,
+                month       DATE NOT NULL,
+                user_id     INTEGER REFERENCES res_users (id) ON DELETE SET NULL,
+                team_id     INTEGER REFERENCES crm_team (id) ON DELETE SET NULL,
+                company_id  INTEGER REFERENCES res_company (id) ON DELETE SET NULL,
+                state       VARCHAR,
+                nbr_cases   INTEGER,
+                duration    DOUBLE PRECISION,
+                nbr_opened  INTEGER,
+                delay_open  DOUBLE PRECISION,
+                nbr_closed  INTEGER,
+                delay_close DOUBLE PRECISION
+            );
+            CREATE INDEX IF NOT EXISTS crm_phonecall_report_monthly_month_index
+                ON crm_phonecall_report_monthly (month);
+            CREATE INDEX IF NOT EXISTS crm_phonecall_report_monthly_team_month_index
+                ON crm_phonecall_report_monthly (team_id, month);
+            CREATE INDEX IF NOT EXISTS crm_phonecall_report_monthly_user_month_index
+                ON crm_phonecall_report_monthly (user_id, month);
+            """
+        )
+        if not exists:
+            self._rebuild_report()
+
+    def _select_months(self, where):
+        return SQL(
+            """
+            INSERT INTO crm_phonecall_report_monthly (
+                month, user_id, team_id, company_id, state, nbr_cases,
+                duration, nbr_opened, delay_open, nbr_closed, delay_close
+            )
+            SELECT date_trunc('month', c.create_date)::date,
+                   c.user_id,
+                   c.team_id,
+                   c.company_id,
+                   c.state,
+                   COUNT(*),
+                   SUM(c.duration),
+                   COUNT(*) FILTER (WHERE c.date_open IS NOT NULL),
+                   SUM(c.delay_open) FILTER (WHERE c.date_open IS NOT NULL),
+                   COUNT(*) FILTER (WHERE c.date_closed IS NOT NULL),
+                   SUM(c.delay_close) FILTER (WHERE c.date_closed IS NOT NULL)
+              FROM crm_phonecall c
+             WHERE c.create_date IS NOT NULL AND %s
+          GROUP BY 1, 2, 3, 4, 5
+            """,
+            where,
+        )
+
+    @api.model
+    def _schedule_refresh(self, dates):
+        """Re-aggregate the months of ``dates`` before the transaction commits."""
+        months = {date.date().replace(day=1) for date in dates if date}
+        if not months:
+            return
+        precommit = self.env.cr.precommit
+        if REFRESH_MONTHS_KEY not in precommit.data:
+            precommit.data[REFRESH_MONTHS_KEY] = set()
+            precommit.add(self._run_scheduled_refresh)
+        precommit.data[REFRESH_MONTHS_KEY].update(months)
+
+    def _run_scheduled_refresh(self):
+        self._refresh_months(self.env.cr.precommit.data.pop(REFRESH_MONTHS_KEY, set()))
+
+    @api.model
+    def _refresh_months(self, months):
+        """Recompute the rows of the given months (first days of month)."""
+        if not months:
+            return
+        self.env["crm.phonecall"].flush_model()
+        cr = self.env.cr
+        for month in sorted(months):
+            next_month = fields.Date.add(month, months=1)
+            cr.execute(
+                "DELETE FROM crm_phonecall_report_monthly WHERE month = %s", (month,)
+            )
+            # Range on create_date so the crm_phonecall indexes are used
+            cr.execute(
+                self._select_months(
+                    SQL(
+                        "c.create_date >= %s AND c.create_date < %s",
+                        month,
+                        next_month,
+                    )
+                )
+            )
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild_report(self):
+        """Rebuild the whole rollup from the phone calls."""
+        self.env["crm.phonecall"].flush_model()
+        cr = self.env.cr
+        cr.execute("TRUNCATE crm_phonecall_report_monthly")
+        cr.execute(self._select_months(SQL("TRUE")))
+        cr.execute("ANALYZE crm_phonecall_report_monthly")
+        self.invalidate_model()
+        _logger.info("Rebuilt %s from all phone calls", self._table)
+
+    @api.model
+    def action_rebuild_report(self):
+        """Full rebuild, exposed as a server action for administrators."""
+        self._rebuild_report()
+        return True
@@ -92,6 +92,14 @@ class TestCrmPhoneCall(common.TransactionCase):
         phonecall.compute_duration()
         self.assertEqual(phonecall.duration, 0.0)
 
+    def test_compute_duration_batch(self):
+        phonecalls = self.phonecall1 + self.phonecall2
+        phonecalls.write({"date": "2017-12-31 00:00:00", "duration": 0.0})
+        self.phonecall2.duration = 2
+        phonecalls.compute_duration()
+        self.assertGreater(self.phonecall1.duration, 0.0)
+        self.assertEqual(self.phonecall2.duration, 0.0)
+
     def test_onchange_partner(self):
         """Partner change method test."""
         phonecall_form = Form(self.phonecall1)
@@ -134,6 +142,21 @@ class TestCrmPhoneCall(common.TransactionCase):
             self.assertEqual(phonecall.source_id, self.source1)
             self.assertEqual(phonecall.medium_id, self.medium1)
 
+    def test_schedule_another_phonecall_batch(self):
+        """Schedule a follow-up of several phonecalls at once."""
+        phonecalls = self.phonecall1 + self.phonecall2
+        new_phonecalls = phonecalls.schedule_another_phonecall(
+            {"schedule_time": False, "name": "Batch follow-up", "action": "log"},
+            return_recordset=True,
+        )
+        self.assertEqual(len(new_phonecalls), 2)
+        self.assertFalse(new_phonecalls & phonecalls)
+        self.assertEqual(set(new_phonecalls.mapped("name")), {"Batch follow-up"})
+        self.assertEqual(set(phonecalls.mapped("state")), {"done"})
+        self.assertEqual(
+            new_phonecalls.mapped("partner_phone"), phonecalls.mapped("partner_phone")
+        )
+
     def test_onchange_opportunity(self):
         """Change the opportunity."""
         phonecall_form = Form(self.phonecall1)
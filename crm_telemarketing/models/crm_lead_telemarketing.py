@@ -1,5 +1,9 @@
 from odoo import models, fields, api
 
+# Lead fields aggregated by the telemarketing dashboard; writes that touch
+# none of them keep its cached payloads.
+DASHBOARD_LEAD_FIELDS = {'user_id', 'type', 'active', 'company_id'}
+
 class CrmLead(models.Model):
     _inherit = 'crm.lead'
 
@@ -22,46 +26,68 @@ class CrmLead(models.Model):
         'telemarketing_call_ids.name_confirmed', 'telemarketing_call_ids.address_confirmed', 'telemarketing_call_ids.phone_confirmed'
     )
     def _compute_data_quality_score(self):
+        latest_calls = self._get_latest_confirming_calls()
         for lead in self:
-            # If the lead is not yet saved, we don't have any calls to compute the score from
-            if not lead.id:
-                lead.data_quality_score = 0
-                continue
-
-                # Get the latest call with confirmations
-            latest_custom_call = self.env['crm.telemarketing.call'].search([
-                ('lead_id', '=', lead.id),
-                '|', '|',
-                ('name_confirmed', '=', True),
-                ('address_confirmed', '=', True),
-                ('phone_confirmed', '=', True),
-            ], order='date desc', limit=1)
-            latest_standard_call = self.env['crm.phonecall'].search([
-                ('opportunity_id', '=', lead.id),
-                '|', '|',
-                ('name_confirmed', '=', True),
-                ('address_confirmed', '=', True),
-                ('phone_confirmed', '=', True),
-            ], order='date desc', limit=1)
-            latest_call = None
-            if latest_custom_call and latest_standard_call:
-                latest_call = latest_custom_call if latest_custom_call.date > latest_standard_call.date else latest_standard_call
-            elif latest_custom_call:
-                latest_call = latest_custom_call
-            elif latest_standard_call:
-                latest_call = latest_standard_call
-            if not latest_call:
+            confirmations = latest_calls.get(lead.id)
+            # Unsaved leads and leads without any confirming call score 0
+            if not confirmations:
                 lead.data_quality_score = 0
                 continue
-            score = 0
-            if latest_call.name_confirmed:
-                score += 1
-            if latest_call.address_confirmed:
-                score += 1
-            if latest_call.phone_confirmed:
-                score += 1
+            score = sum(1 for confirmed in confirmations if confirmed)
             lead.data_quality_score = int((score / 3.0) * 100)
 
+    def _get_latest_confirming_calls(self):
+        """Return ``{lead_id: (name_confirmed, address_confirmed, phone_confirmed)}``
+        of the latest call confirming at least one of them, across telemarketing
+        calls and phone calls, with one ``DISTINCT ON`` query per call table.
+        On equal dates the phone call wins."""
+        lead_ids = tuple(id_ for id_ in self.ids if id_)
+        if not lead_ids:
+            return {}
+        confirmed_fields = ['name_confirmed', 'address_confirmed', 'phone_confirmed']
+        self.env['crm.telemarketing.call'].flush_model(['lead_id', 'date', *confirmed_fields])
+        self.env['crm.phonecall'].flush_model(['opportunity_id', 'date', 'active', *confirmed_fields])
+        latest = {}
+        for query in (
+            """SELECT DISTINCT ON (lead_id)
+                      lead_id, date, name_confirmed, address_confirmed, phone_confirmed
+                 FROM crm_telemarketing_call
+                WHERE lead_id IN %s
+                  AND (name_confirmed OR address_confirmed OR phone_confirmed)
+             ORDER BY lead_id, date DESC NULLS LAST, id DESC""",
+            """SELECT DISTINCT ON (opportunity_id)
+                      opportunity_id, date, name_confirmed, address_confirmed, phone_confirmed
+                 FROM crm_phonecall
+                WHERE opportunity_id IN %s
+                  AND active
+                  AND (name_confirmed OR address_confirmed OR phone_confirmed)
+             ORDER BY opportunity_id, date DESC NULLS LAST, id DESC""",
+        ):
+            self.env.cr.execute(query, (lead_ids,))
+            for lead_id, date, *confirmations in self.env.cr.fetchall():
+                previous = latest.get(lead_id)
+                if previous and previous[0] and (not date or previous[0] > date):
+                    continue
+                latest[lead_id] = (date, confirmations)
+        return {lead_id: confirmations for lead_id, (_date, confirmations) in latest.items()}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        leads = super().create(vals_list)
+        self.env['report.telemarketing_dashboard.dashboard']._invalidate_dashboard_cache()
+        return leads
+
+    def write(self, vals):
+        res = super().write(vals)
+        if DASHBOARD_LEAD_FIELDS.intersection(vals):
+            self.env['report.telemarketing_dashboard.dashboard']._invalidate_dashboard_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env['report.telemarketing_dashboard.dashboard']._invalidate_dashboard_cache()
+        return res
+
 
     # [FIXED] This method now opens the unified report view.
     def action_view_data_quality_calls(self):
@@ -1,4 +1,11 @@
-from odoo import models, fields
+from odoo import api, models, fields
+
+# Fields copied into the report.telemarketing fact table; writes that touch
+# none of them do not need to refresh the report rows.
+PHONECALL_REPORT_FIELDS = {
+    'date', 'user_id', 'opportunity_id', 'state', 'direction', 'duration',
+    'service_rating', 'product_rating',
+}
 
 class CrmPhonecall(models.Model):
     _inherit = 'crm.phonecall'
@@ -17,3 +24,22 @@ class CrmPhonecall(models.Model):
     phone_confirmed = fields.Boolean(string="Phone Confirmed")
     email_confirmed = fields.Boolean(string="Email Confirmed")
     notes = fields.Text(string="Additional Notes")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        calls = super().create(vals_list)
+        self.env['report.telemarketing']._refresh_report_rows(phonecall_ids=calls.ids)
+        self.env['report.telemarketing_dashboard.dashboard']._invalidate_dashboard_cache()
+        return calls
+
+    def write(self, vals):
+        res = super().write(vals)
+        if PHONECALL_REPORT_FIELDS.intersection(vals):
+            self.env['report.telemarketing']._refresh_report_rows(phonecall_ids=self.ids)
+            self.env['report.telemarketing_dashboard.dashboard']._invalidate_dashboard_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env['report.telemarketing_dashboard.dashboard']._invalidate_dashboard_cache()
+        return res
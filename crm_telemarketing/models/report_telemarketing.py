@@ -1,100 +1,207 @@
-from odoo import fields, models, tools
-
-
-class ReportTelemarketing(models.Model):
-    _name = "report.telemarketing"
-    _description = "Telemarketing Report"
-    _auto = False
-    _rec_name = "date"
-
-    date = fields.Datetime("Date", readonly=True)
-    user_id = fields.Many2one("res.users", "Responsible", readonly=True)
-    lead_id = fields.Many2one("crm.lead", "Lead/Opportunity", readonly=True)
-    call_type = fields.Selection([("sales", "Sales Call"), ("survey", "Satisfaction Survey")], string="Call Type",
-                                 readonly=True)
-    call_status_display = fields.Char("Status", readonly=True)
-
-    # [FIXED] The 'direction' field has been added back to the model definition
-    direction = fields.Selection(
-        [("inbound", "Inbound"), ("outbound", "Outbound")],
-        string="Direction", readonly=True
-    )
-
-    duration = fields.Float("Duration (min)", readonly=True)
-    total_calls = fields.Integer("Total Calls", readonly=True)
-    done_calls = fields.Integer("Completed Calls", readonly=True)
-    brand_awareness_created = fields.Integer(string="# Brand Awareness", readonly=True)
-    orders_generated = fields.Integer(string="# Orders Generated", readonly=True)
-    quality_rating = fields.Selection([('1', '⭐'), ('2', '⭐⭐'), ('3', '⭐⭐⭐'), ('4', '⭐⭐⭐⭐'), ('5', '⭐⭐⭐⭐⭐')],
-                                      string="Quality Rating", readonly=True)
-    avg_service_rating = fields.Float(string="Avg Service Rating", readonly=True, group_operator='avg')
-    avg_product_rating = fields.Float(string="Avg Product Rating", readonly=True, group_operator='avg')
-    status_id = fields.Many2one("crm.telemarketing.status", "Status Ref", readonly=True)
-    source_model = fields.Selection([("telemarketing", "Telemarketing"), ("phonecall", "Phone Call")], string="Source",
-                                    readonly=True)
-    pending_calls = fields.Integer("Pending Calls", readonly=True)
-
-    def init(self):
-        tools.drop_view_if_exists(self._cr, self._table)
-        self._cr.execute("""
-                         CREATE or REPLACE VIEW report_telemarketing AS
-                         (
-                         -- Telemarketing Calls from this module
-                         SELECT c.id,
-                                c.date,
-                                c.user_id,
-                                c.lead_id,
-                                c.call_type,
-                                CASE c.state
-                                    WHEN 'open' THEN 'Confirmed'
-                                    WHEN 'cancel' THEN 'Cancelled'
-                                    WHEN 'pending' THEN 'Pending'
-                                    WHEN 'done' THEN 'Held'
-                                    ELSE c.state
-                                    END                                               as call_status_display,
-                                c.direction, -- This SELECT is correct
-                                (c.duration / 60.0)                                   as duration,
-                                1                                                     as total_calls,
-                                CASE WHEN c.state = 'done' THEN 1 ELSE 0 END          as done_calls,
-                                CASE WHEN c.brand_awareness_created THEN 1 ELSE 0 END as brand_awareness_created,
-                                (SELECT COUNT(*)
-                                 FROM crm_telemarketing_call_sale_order_rel so_rel
-                                 WHERE so_rel.crm_telemarketing_call_id = c.id)       as orders_generated,
-                                c.quality_rating,
-                                CAST(c.service_rating AS FLOAT)                       as avg_service_rating,
-                                CAST(c.product_rating AS FLOAT)                       as avg_product_rating,
-                                c.status_id,
-                                'telemarketing_dashboard'                                       as source_model,
-                                CASE WHEN c.state = 'pending' THEN 1 ELSE 0 END       as pending_calls
-                         FROM crm_telemarketing_call c
-
-                         UNION ALL
-
-                         -- Standard Odoo Phonecalls (Logged Calls)
-                         SELECT p.id + 2000000                                                  as id,
-                                p.date,
-                                p.user_id,
-                                p.opportunity_id                                                as lead_id,
-                                'sales'                                                         as call_type,
-                                CASE p.state
-                                    WHEN 'open' THEN 'Confirmed'
-                                    WHEN 'cancel' THEN 'Cancelled'
-                                    WHEN 'pending' THEN 'Pending'
-                                    WHEN 'done' THEN 'Held'
-                                    ELSE p.state
-                                    END                                                         as call_status_display,
-                                CASE WHEN p.direction = 'in' THEN 'inbound' ELSE 'outbound' END as direction, -- This SELECT is also correct
-                                p.duration,
-                                1                                                               as total_calls,
-                                CASE WHEN p.state = 'done' THEN 1 ELSE 0 END                    as done_calls,
-                                0                                                               as brand_awareness_created,
-                                0                                                               as orders_generated,
-                                NULL                                                            as quality_rating,
-                                CAST(p.service_rating AS FLOAT)                                 as avg_service_rating,
-                                CAST(p.product_rating AS FLOAT)                                 as avg_product_rating,
-                                NULL                                                            as status_id,
-                                'phonecall'                                                     as source_model,
-                                CASE WHEN p.state = 'pending' THEN 1 ELSE 0 END                 as pending_calls
-                         FROM crm_phonecall p
-                             )
-                         """)
\ No newline at end of file
+import logging
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+
+class ReportTelemarketing(models.Model):
+    """Telemarketing fact table.
+
+    ``report_telemarketing`` is a real, indexed table holding one row per
+    ``crm.telemarketing.call`` and per ``crm.phonecall``. Rows are refreshed
+    incrementally from the create/write hooks of both call models and are
+    removed by the ``ON DELETE CASCADE`` foreign keys, so pivots never have to
+    re-scan the call history. Ids are stable: ``2 * id`` for telemarketing
+    calls and ``2 * id + 1`` for phone calls.
+    """
+    _name = "report.telemarketing"
+    _description = "Telemarketing Report"
+    _auto = False
+    _rec_name = "date"
+
+    date = fields.Datetime("Date", readonly=True)
+    user_id = fields.Many2one("res.users", "Responsible", readonly=True)
+    lead_id = fields.Many2one("crm.lead", "Lead/Opportunity", readonly=True)
+    call_type = fields.Selection([("sales", "Sales Call"), ("survey", "Satisfaction Survey")], string="Call Type",
+                                 readonly=True)
+    call_status_display = fields.Char("Status", readonly=True)
+
+    # [FIXED] The 'direction' field has been added back to the model definition
+    direction = fields.Selection(
+        [("inbound", "Inbound"), ("outbound", "Outbound")],
+        string="Direction", readonly=True
+    )
+
+    duration = fields.Float("Duration (min)", readonly=True)
+    total_calls = fields.Integer("Total Calls", readonly=True)
+    done_calls = fields.Integer("Completed Calls", readonly=True)
+    brand_awareness_created = fields.Integer(string="# Brand Awareness", readonly=True)
+    orders_generated = fields.Integer(string="# Orders Generated", readonly=True)
+    quality_rating = fields.Selection([('1', '⭐'), ('2', '⭐⭐'), ('3', '⭐⭐⭐'), ('4', '⭐⭐⭐⭐'), ('5', '⭐⭐⭐⭐⭐')],
+                                      string="Quality Rating", readonly=True)
+    avg_service_rating = fields.Float(string="Avg Service Rating", readonly=True, group_operator='avg')
+    avg_product_rating = fields.Float(string="Avg Product Rating", readonly=True, group_operator='avg')
+    status_id = fields.Many2one("crm.telemarketing.status", "Status Ref", readonly=True)
+    source_model = fields.Selection([("telemarketing", "Telemarketing"), ("phonecall", "Phone Call")], string="Source",
+                                    readonly=True)
+    pending_calls = fields.Integer("Pending Calls", readonly=True)
+    telemarketing_call_id = fields.Many2one("crm.telemarketing.call", "Telemarketing Call", readonly=True)
+    phonecall_id = fields.Many2one("crm.phonecall", "Phone Call", readonly=True)
+
+    def init(self):
+        cr = self._cr
+        cr.execute("SELECT relkind FROM pg_class WHERE relname = %s", (self._table,))
+        row = cr.fetchone()
+        if row and row[0] == 'v':
+            # Previous versions exposed the report as a plain UNION view
+            cr.execute("DROP VIEW report_telemarketing CASCADE")
+            row = None
+        cr.execute("""
+            CREATE TABLE IF NOT EXISTS report_telemarketing (
+                id                      INTEGER PRIMARY KEY,
+                date                    TIMESTAMP,
+                user_id                 INTEGER REFERENCES res_users (id) ON DELETE SET NULL,
+                lead_id                 INTEGER REFERENCES crm_lead (id) ON DELETE SET NULL,
+                call_type               VARCHAR,
+                call_status_display     VARCHAR,
+                direction               VARCHAR,
+                duration                DOUBLE PRECISION,
+                total_calls             INTEGER,
+                done_calls              INTEGER,
+                brand_awareness_created INTEGER,
+                orders_generated        INTEGER,
+                quality_rating          VARCHAR,
+                avg_service_rating      DOUBLE PRECISION,
+                avg_product_rating      DOUBLE PRECISION,
+                status_id               INTEGER REFERENCES crm_telemarketing_status (id) ON DELETE SET NULL,
+                source_model            VARCHAR,
+                pending_calls           INTEGER,
+                telemarketing_call_id   INTEGER UNIQUE REFERENCES crm_telemarketing_call (id) ON DELETE CASCADE,
+                phonecall_id            INTEGER UNIQUE REFERENCES crm_phonecall (id) ON DELETE CASCADE
+            )
+        """)
+        cr.execute("""
+            CREATE INDEX IF NOT EXISTS report_telemarketing_date_index
+                ON report_telemarketing (date);
+            CREATE INDEX IF NOT EXISTS report_telemarketing_user_date_index
+                ON report_telemarketing (user_id, date);
+            CREATE INDEX IF NOT EXISTS report_telemarketing_direction_date_index
+                ON report_telemarketing (direction, date);
+            CREATE INDEX IF NOT EXISTS report_telemarketing_source_status_date_index
+                ON report_telemarketing (source_model, call_status_display, date);
+            CREATE INDEX IF NOT EXISTS report_telemarketing_lead_id_index
+                ON report_telemarketing (lead_id);
+        """)
+        if not row:
+            self._rebuild_report()
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def _select_telemarketing_calls(self, where=""):
+        return """
+            SELECT c.id * 2                                              as id,
+                   c.date,
+                   c.user_id,
+                   c.lead_id,
+                   c.call_type,
+                   CASE c.state
+                       WHEN 'open' THEN 'Confirmed'
+                       WHEN 'cancel' THEN 'Cancelled'
+                       WHEN 'pending' THEN 'Pending'
+                       WHEN 'done' THEN 'Held'
+                       ELSE c.state
+                       END                                               as call_status_display,
+                   c.direction,
+                   (c.duration / 60.0)                                   as duration,
+                   1                                                     as total_calls,
+                   CASE WHEN c.state = 'done' THEN 1 ELSE 0 END          as done_calls,
+                   CASE WHEN c.brand_awareness_created THEN 1 ELSE 0 END as brand_awareness_created,
+                   COALESCE(so.orders, 0)                                as orders_generated,
+                   c.quality_rating,
+                   CAST(c.service_rating AS FLOAT)                       as avg_service_rating,
+                   CAST(c.product_rating AS FLOAT)                       as avg_product_rating,
+                   c.status_id,
+                   'telemarketing'                                       as source_model,
+                   CASE WHEN c.state = 'pending' THEN 1 ELSE 0 END       as pending_calls,
+                   c.id                                                  as telemarketing_call_id,
+                   NULL::integer                                         as phonecall_id
+              FROM crm_telemarketing_call c
+         LEFT JOIN (SELECT crm_telemarketing_call_id, COUNT(*) as orders
+                      FROM crm_telemarketing_call_sale_order_rel
+                  GROUP BY crm_telemarketing_call_id) so
+                ON so.crm_telemarketing_call_id = c.id
+            %s
+        """ % where
+
+    def _select_phonecalls(self, where=""):
+        return """
+            SELECT p.id * 2 + 1                                                    as id,
+                   p.date,
+                   p.user_id,
+                   p.opportunity_id                                                as lead_id,
+                   'sales'                                                         as call_type,
+                   CASE p.state
+                       WHEN 'open' THEN 'Confirmed'
+                       WHEN 'cancel' THEN 'Cancelled'
+                       WHEN 'pending' THEN 'Pending'
+                       WHEN 'done' THEN 'Held'
+                       ELSE p.state
+                       END                                                         as call_status_display,
+                   CASE WHEN p.direction = 'in' THEN 'inbound' ELSE 'outbound' END as direction,
+                   p.duration,
+                   1                                                               as total_calls,
+                   CASE WHEN p.state = 'done' THEN 1 ELSE 0 END                    as done_calls,
+                   0                                                               as brand_awareness_created,
+                   0                                                               as orders_generated,
+                   NULL                                                            as quality_rating,
+                   CAST(p.service_rating AS FLOAT)                                 as avg_service_rating,
+                   CAST(p.product_rating AS FLOAT)                                 as avg_product_rating,
+                   NULL::integer                                                   as status_id,
+                   'phonecall'                                                     as source_model,
+                   CASE WHEN p.state = 'pending' THEN 1 ELSE 0 END                 as pending_calls,
+                   NULL::integer                                                   as telemarketing_call_id,
+                   p.id                                                            as phonecall_id
+              FROM crm_phonecall p
+            %s
+        """ % where
+
+    @api.model
+    def _refresh_report_rows(self, telemarketing_call_ids=(), phonecall_ids=()):
+        """Re-copy the given calls into the fact table (upsert by source id)."""
+        if not telemarketing_call_ids and not phonecall_ids:
+            return
+        cr = self.env.cr
+        if telemarketing_call_ids:
+            self.env['crm.telemarketing.call'].flush_model()
+            ids = tuple(telemarketing_call_ids)
+            cr.execute("DELETE FROM report_telemarketing WHERE telemarketing_call_id IN %s", (ids,))
+            cr.execute("INSERT INTO report_telemarketing " + self._select_telemarketing_calls("WHERE c.id IN %s"),
+                       (ids,))
+        if phonecall_ids:
+            self.env['crm.phonecall'].flush_model()
+            ids = tuple(phonecall_ids)
+            cr.execute("DELETE FROM report_telemarketing WHERE phonecall_id IN %s", (ids,))
+            cr.execute("INSERT INTO report_telemarketing " + self._select_phonecalls("WHERE p.id IN %s"), (ids,))
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild_report(self):
+        """Rebuild the whole fact table from both call models."""
+        self.env['crm.telemarketing.call'].flush_model()
+        self.env['crm.phonecall'].flush_model()
+        cr = self.env.cr
+        cr.execute("TRUNCATE report_telemarketing")
+        cr.execute("INSERT INTO report_telemarketing " + self._select_telemarketing_calls())
+        cr.execute("INSERT INTO report_telemarketing " + self._select_phonecalls())
+        cr.execute("ANALYZE report_telemarketing")
+        self.invalidate_model()
+        _logger.info("Rebuilt %s with all telemarketing calls and phone calls", self._table)
+
+    @api.model
+    def action_rebuild_report(self):
+        """Full rebuild, exposed as a server action for administrators."""
+        self._rebuild_report()
+        return True
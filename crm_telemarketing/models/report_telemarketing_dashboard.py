@@ -1,5 +1,20 @@
 # models/report_telemarketing_dashboard.py
-from odoo import api, fields, models
+import hashlib
+import json
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from odoo import api, fields, models, tools
+
+# Results of the OWL dashboard endpoint live in the registry cache, keyed per
+# (user, companies, lang, range) and per DASHBOARD_CACHE_TTL seconds wide time
+# bucket. Writes to the reported lead and call fields clear the registry cache,
+# which the other workers pick up at their next request.
+DASHBOARD_CACHE_TTL = 120
+# Key of the cursor's postcommit data: the cache is cleared once per commit
+DASHBOARD_CACHE_INVALIDATED_KEY = 'report.telemarketing_dashboard.cache_invalidated'
+
 
 class ReportTelemarketingDashboard(models.TransientModel):
     _name = "report.telemarketing_dashboard.dashboard"
@@ -49,4 +64,189 @@ class ReportTelemarketingDashboard(models.TransientModel):
             "pending_calls": pending,
             "avg_duration": avg_duration,
             "completion_rate": completion_rate,
-        }
\ No newline at end of file
+        }
+
+    # -------------------------------------------------------------------------
+    # OWL dashboard payload (cached)
+    # -------------------------------------------------------------------------
+
+    @api.model
+    def get_cached_dashboard_payload(self, start_date=None, end_date=None):
+        """Return ``(etag, payload)`` for the OWL dashboard, served from the
+        registry cache when an entry of the current time bucket exists."""
+        return self._get_cached_dashboard_payload(
+            tuple(self.env.companies.ids),
+            self.env.lang,
+            start_date or '',
+            end_date or '',
+            int(time.time() // DASHBOARD_CACHE_TTL),
+        )
+
+    @api.model
+    @tools.ormcache('self.env.uid', 'company_ids', 'lang', 'start_date', 'end_date', 'time_bucket')
+    def _get_cached_dashboard_payload(self, company_ids, lang, start_date, end_date, time_bucket):
+        payload = self._compute_owl_dashboard_payload(start_date or None, end_date or None)
+        etag = hashlib.sha1(
+            json.dumps(payload, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return etag, payload
+
+    @api.model
+    def _invalidate_dashboard_cache(self):
+        """Clear the cached dashboard payloads in every worker, now and once
+        the transaction is committed (so a concurrent request cannot re-cache
+        the pre-commit figures)."""
+        registry = self.env.registry
+        registry.clear_cache()
+        postcommit = self.env.cr.postcommit
+        if DASHBOARD_CACHE_INVALIDATED_KEY not in postcommit.data:
+            postcommit.data[DASHBOARD_CACHE_INVALIDATED_KEY] = True
+            postcommit.add(registry.clear_cache)
+
+    @api.model
+    def _compute_owl_dashboard_payload(self, start_date=None, end_date=None):
+        """Build the OWL dashboard data with grouped queries only; every
+        section honours the ``start_date``/``end_date`` filter."""
+        date_from = fields.Date.to_date(start_date) if start_date else False
+        date_to = fields.Date.to_date(end_date) if end_date else False
+
+        def datetime_domain(field_name):
+            domain = []
+            if date_from:
+                domain.append((field_name, '>=', fields.Datetime.to_datetime(date_from)))
+            if date_to:
+                domain.append((field_name, '<', fields.Datetime.to_datetime(date_to + timedelta(days=1))))
+            return domain
+
+        salesperson_data = defaultdict(lambda: {
+            'target': 0,
+            'total_leads': 0,
+            'converted_leads': 0,
+            'conversion_rate': 0.0,
+            'leads_registered_target': 0,
+            'leads_registered_actual': 0,
+            'leads_registered_percent': 0.0,
+            'data_quality_target': 0,
+            'data_quality_actual': 0,
+            'data_quality_percent': 0.0,
+        })
+
+        # --- 1. Leads, per salesperson and type, in one grouped query ---
+        lead_domain = datetime_domain('create_date')
+        total_leads = converted_leads = 0
+        lead_groups = self.env['crm.lead'].read_group(
+            domain=lead_domain,
+            fields=['user_id'],
+            groupby=['user_id', 'type'],
+            lazy=False,
+        )
+        for group in lead_groups:
+            count = group['__count']
+            is_opportunity = group['type'] == 'opportunity'
+            total_leads += count
+            if is_opportunity:
+                converted_leads += count
+            if group['user_id']:
+                sp = salesperson_data[group['user_id'][1]]
+                sp['total_leads'] += count
+                if is_opportunity:
+                    sp['converted_leads'] += count
+        for data in salesperson_data.values():
+            total = data['total_leads']
+            data['conversion_rate'] = round((data['converted_leads'] / total) * 100, 2) if total else 0
+        conversion_rate = (converted_leads / total_leads) * 100 if total_leads else 0
+
+        total_competitors = 0
+        if 'competitor.competitor' in self.env:
+            total_competitors = self.env['competitor.competitor'].search_count(lead_domain)
+
+        # --- 2. Call KPIs from report.telemarketing ---
+        Report = self.env['report.telemarketing']
+        call_domain = datetime_domain('date')
+        call_data = Report.read_group(
+            domain=call_domain,
+            fields=['total_calls:sum', 'duration:avg'],
+            groupby=[],
+        )
+        total_calls, avg_duration = 0, 0.0
+        if call_data:
+            total_calls = call_data[0]['total_calls'] or 0
+            avg_duration = call_data[0]['duration'] or 0.0
+
+        # Bar chart: "Inbound vs Outbound by Day"
+        chart_data_raw = Report.read_group(
+            domain=call_domain,
+            fields=['total_calls:sum'],
+            groupby=['date:day', 'direction'],
+            lazy=False,
+        )
+        bar_chart_data = {'labels': [], 'datasets': {}}
+        labels_set = set()
+        for rec in chart_data_raw:
+            day = rec['date:day']
+            labels_set.add(day)
+            bar_chart_data['datasets'].setdefault(rec['direction'], {})[day] = rec['total_calls']
+        bar_chart_data['labels'] = sorted(labels_set)
+
+        # Pivot table: "Calls by User - Direction"
+        pivot_data_raw = Report.read_group(
+            domain=call_domain,
+            fields=['total_calls:sum', 'done_calls:sum', 'pending_calls:sum'],
+            groupby=['user_id', 'direction'],
+            lazy=False,
+        )
+        pivot_data = defaultdict(lambda: defaultdict(int))
+        for rec in pivot_data_raw:
+            user_name = rec['user_id'][1] if rec['user_id'] else 'Unassigned'
+            direction = rec['direction']
+            pivot_data[user_name][f"{direction}_total"] = rec['total_calls']
+            pivot_data[user_name][f"{direction}_done"] = rec['done_calls']
+            pivot_data[user_name][f"{direction}_pending"] = rec['pending_calls']
+
+        # --- 3. KPI target lines, aggregated per user and definition ---
+        if 'kpi.target.line' in self.env:
+            kpi_domain = []
+            if date_from:
+                kpi_domain.append(('date_start', '>=', date_from))
+            if date_to:
+                kpi_domain.append(('date_end', '<=', date_to))
+            kpi_groups = self.env['kpi.target.line'].read_group(
+                domain=kpi_domain,
+                fields=['target_value:sum', 'actual_value:sum', 'achievement_percentage:avg'],
+                groupby=['user_id', 'kpi_definition_id'],
+                lazy=False,
+            )
+            definition_ids = {g['kpi_definition_id'][0] for g in kpi_groups if g['kpi_definition_id']}
+            kpi_types = {
+                d['id']: d['kpi_type']
+                for d in self.env['kpi.definition'].browse(definition_ids).read(['kpi_type'])
+            }
+            for group in kpi_groups:
+                if not group['user_id'] or not group['kpi_definition_id']:
+                    continue
+                kpi_type = kpi_types.get(group['kpi_definition_id'][0])
+                if kpi_type not in ('leads_registered', 'data_quality'):
+                    continue
+                sp = salesperson_data[group['user_id'][1]]
+                sp[f'{kpi_type}_target'] += group['target_value']
+                sp[f'{kpi_type}_actual'] += group['actual_value']
+                sp[f'{kpi_type}_percent'] = group['achievement_percentage'] or 0.0
+
+        return {
+            'kpis': {
+                'total_leads': total_leads,
+                'converted_leads': converted_leads,
+                'conversion_rate': conversion_rate,
+                'total_calls': total_calls,
+                'avg_duration': round(avg_duration, 2),
+                'total_competitors': total_competitors,
+            },
+            'bar_chart': bar_chart_data,
+            'pivot_table': {
+                'headers': ['Inbound', 'Outbound'],  # For dynamic column generation
+                'rows': pivot_data,
+            },
+            'salesperson_data': [
+                {'salesperson': sp, **data} for sp, data in salesperson_data.items()
+            ],
+        }
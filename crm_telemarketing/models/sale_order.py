@@ -0,0 +1,13 @@
+from odoo import models
+
+
+class SaleOrder(models.Model):
+    _inherit = 'sale.order'
+
+    def unlink(self):
+        # Deleting an order drops its relation rows in SQL, so the
+        # "# Orders Generated" figure of the linked calls must be re-copied.
+        call_ids = self.env['crm.telemarketing.call'].search([('sale_order_ids', 'in', self.ids)]).ids
+        res = super().unlink()
+        self.env['report.telemarketing']._refresh_report_rows(telemarketing_call_ids=call_ids)
+        return res
@@ -1,5 +1,13 @@
 from odoo import models, fields, api
 
+# Fields copied into the report.telemarketing fact table; writes that touch
+# none of them do not need to refresh the report rows.
+TELEMARKETING_REPORT_FIELDS = {
+    'date', 'user_id', 'lead_id', 'call_type', 'state', 'direction', 'duration',
+    'brand_awareness_created', 'sale_order_ids', 'quality_rating',
+    'service_rating', 'product_rating', 'status_id',
+}
+
 class CrmTelemarketingCall(models.Model):
     _name = "crm.telemarketing.call"
     _inherit = ['mail.thread', 'mail.activity.mixin'] # Keeps chatter functionality
@@ -64,4 +72,23 @@ class CrmTelemarketingCall(models.Model):
         This onchange is now less critical as the main state is managed separately,
         but can be kept for other automations if needed.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        calls = super().create(vals_list)
+        self.env['report.telemarketing']._refresh_report_rows(telemarketing_call_ids=calls.ids)
+        self.env['report.telemarketing_dashboard.dashboard']._invalidate_dashboard_cache()
+        return calls
+
+    def write(self, vals):
+        res = super().write(vals)
+        if TELEMARKETING_REPORT_FIELDS.intersection(vals):
+            self.env['report.telemarketing']._refresh_report_rows(telemarketing_call_ids=self.ids)
+            self.env['report.telemarketing_dashboard.dashboard']._invalidate_dashboard_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env['report.telemarketing_dashboard.dashboard']._invalidate_dashboard_cache()
+        return res
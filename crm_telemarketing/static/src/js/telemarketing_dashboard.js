@@ -28,6 +28,8 @@ export class TelemarketingDashboard extends Component {
         this.barChartRef = useRef("bar_chart");
         this.charts = {};
         this.isPolling = true;
+        // ETag of the last payload, sent back so unchanged polls stay cheap
+        this.etag = null;
 
         onWillStart(() => this.loadDashboardData());
 
@@ -55,8 +57,10 @@ export class TelemarketingDashboard extends Component {
         const data = await this.rpc("/telemarketing/dashboard/data", {
             start_date: this.state.filter.start_date || '',
             end_date: this.state.filter.end_date || '',
+            etag: this.etag,
         });
-        if (!this.isPolling) return;
+        if (!this.isPolling || data.not_modified) return;
+        this.etag = data.etag || null;
 
         this.state.kpis = data.kpis || this.state.kpis;
         this.state.bar_chart = data.bar_chart || { labels: [], datasets: {} };
@@ -93,6 +97,7 @@ export class TelemarketingDashboard extends Component {
     }
 
     applyFilter() {
+        this.etag = null;
         this.loadDashboardData();
     }
 }
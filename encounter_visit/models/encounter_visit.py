@@ -5,7 +5,7 @@ class EncounterVisit(models.Model):
     _name = "encounter.encounter_visit"
     _description = "Encounter Visit"
     _order = "date desc"
-    _inherit = ["mail.thread", "mail.activity.mixin"]
+    _inherit = ["mail.thread", "mail.activity.mixin", "geo.search.mixin"]
    
     code = fields.Char(required=True, copy=False, readonly=True,
                        index=True, default="New", tracking=True)
@@ -62,6 +62,11 @@ class EncounterVisit(models.Model):
             self.company_ids = self.partner_id.company_id
 
 
+    def _get_nearby_leads(self, radius_km=5.0, limit=None):
+        """Leads geocoded within ``radius_km`` of this visit, nearest first."""
+        self.ensure_one()
+        return self.env["crm.lead"].geo_search_radius(self.latitude, self.longitude, radius_km, limit=limit)
+
     @api.model
     def create(self, vals):
         vals["code"] = self.env["ir.sequence"].sudo().next_by_code("encounter.encounter_visit") or "New"
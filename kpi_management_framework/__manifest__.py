@@ -25,6 +25,7 @@
         'views/kpi_target_line_views.xml',
         'views/kpi_history_views.xml',
         'views/telemarketing_confirmation_views.xml',
+        'wizard/telemarketing_confirmation_wizard_views.xml',
         'views/kpi_dashboard_views.xml',
         'views/kpi_reporting_views.xml',
         # 'views/kpi_views.xml',
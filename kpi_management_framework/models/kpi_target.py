@@ -104,18 +104,11 @@ class KpiTarget(models.Model):
                 target.working_days = 0
                 continue
 
-            holiday_dates = set()
-            if target.holiday_schedule_id:
-                holiday_dates = set(target.holiday_schedule_id.line_ids.mapped('holiday_date'))
-
-            working_days_count = 0
-            current_date = target.date_start
-            while current_date <= target.date_end:
-                if current_date.weekday() < 6 and current_date not in holiday_dates:
-                    working_days_count += 1
-                current_date += timedelta(days=1)
-
-            target.working_days = working_days_count
+            # Weekdays are counted arithmetically and the holidays by bisection
+            # in the cached, sorted holiday dates of the schedule
+            target.working_days = target.holiday_schedule_id.count_working_days(
+                target.date_start, target.date_end
+            )
 
     @api.depends('history_ids')
     def _compute_activity_count(self):
@@ -197,6 +190,15 @@ class KpiTarget(models.Model):
             target.last_computed_date = fields.Datetime.now()
             _logger.info(f"Completed recalculation for KPI Target '{target.name}'.")
 
+    def _stream_import_reconcile(self):
+        """Compute the actual values of a chunk of streamed targets in one pass.
+
+        Actual values and history are local to each database, so they are
+        never imported; the stream_data command of commission_system calls
+        this once per committed chunk.
+        """
+        self._recalculate_values()
+
     def _calculate_leads_registered(self, target, kpi, history_vals_list):
         """Calculate count of leads registered by user"""
         date_from = fields.Datetime.to_datetime(target.date_start)
@@ -111,19 +111,28 @@ class KpiTargetLine(models.Model):
         for rec in self:
             rec.target_value = rec.target_value_percentage
 
-    @api.model
-    def create(self, vals):
-        # Ensure target_value has a default if not provided
-        if 'target_value' not in vals or vals.get('target_value') == 0.0:
-            # Set default based on KPI type if we can determine it
-            kpi_def_id = vals.get('kpi_definition_id')
-            if kpi_def_id:
-                kpi_def = self.env['kpi.definition'].browse(kpi_def_id)
-                if kpi_def.kpi_type == 'data_quality':
-                    vals['target_value'] = 75.0
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Read the KPI definitions of the whole batch at once
+        kpi_defs = {kpi_def.id: kpi_def for kpi_def in self.env['kpi.definition'].browse(
+            {vals['kpi_definition_id'] for vals in vals_list if vals.get('kpi_definition_id')}
+        )}
+        for vals in vals_list:
+            # Ensure target_value has a default if not provided
+            if 'target_value' not in vals or vals.get('target_value') == 0.0:
+                # Set default based on KPI type if we can determine it
+                kpi_def_id = vals.get('kpi_definition_id')
+                if kpi_def_id:
+                    kpi_def = kpi_defs[kpi_def_id]
+                    if kpi_def.kpi_type == 'data_quality':
+                        vals['target_value'] = 75.0
+                    else:
+                        vals['target_value'] = 10.0
                 else:
-                    vals['target_value'] = 10.0
-            else:
-                vals['target_value'] = 0.0
+                    vals['target_value'] = 0.0
+
+        return super().create(vals_list)
 
-        return super().create(vals)
\ No newline at end of file
+    def _stream_import_reconcile(self):
+        """Recompute the targets of a chunk of streamed lines once."""
+        self.target_id._stream_import_reconcile()
\ No newline at end of file
@@ -3,6 +3,16 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+CONFIRMATION_FIELDS = [
+    'name_confirmed',
+    'address_confirmed',
+    'phone_confirmed',
+    'service_satisfaction_confirmed',
+    'product_information_confirmed',
+]
+# Users whose KPI targets must be recalculated before the transaction commits
+KPI_UPDATE_USERS_KEY = 'telemarketing.confirmation.kpi_update_user_ids'
+
 
 class TelemarketingConfirmation(models.Model):
     _name = 'telemarketing.confirmation'
@@ -30,37 +40,84 @@ class TelemarketingConfirmation(models.Model):
     @api.depends('name_confirmed', 'address_confirmed', 'phone_confirmed',
                  'service_satisfaction_confirmed', 'product_information_confirmed')
     def _compute_overall_score(self):
-        fields_to_check = ['name_confirmed', 'address_confirmed', 'phone_confirmed',
-                           'service_satisfaction_confirmed', 'product_information_confirmed']
+        fields_to_check = CONFIRMATION_FIELDS
         for rec in self:
             confirmed_count = sum(1 for f in fields_to_check if getattr(rec, f))
             rec.overall_score = (confirmed_count / len(fields_to_check)) * 100 if fields_to_check else 0
 
     def _get_default_name(self):
+        return self._reserve_names(1)[0]
+
+    @api.model
+    def _reserve_names(self, count):
+        """Return ``count`` new confirmation names.
+
+        The sequence numbers are reserved as one block (a single ``nextval``
+        over ``generate_series``) when the sequence is a plain standard one;
+        no-gap and date-range sequences are consumed number by number.
+        """
         prefix = self.env['ir.config_parameter'].sudo().get_param(
             'telemarketing.confirmation.prefix', default='CONF'
         )
-        seq = self.env['ir.sequence'].next_by_code('telemarketing.confirmation')
-        if seq:
-            # Include year and month automatically
-            current_date = fields.Date.today()
-            year = current_date.strftime("%Y")
-            month = current_date.strftime("%m")
-            return f"{prefix}/{year}/{month}/{seq}"
-        return f"{prefix}/0000"
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', 'telemarketing.confirmation'),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return [f"{prefix}/0000"] * count
+        if sequence.implementation == 'standard' and not sequence.use_date_range:
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                ('ir_sequence_%03d' % sequence.id, count),
+            )
+            numbers = sorted(row[0] for row in self.env.cr.fetchall())
+            seqs = [sequence.get_next_char(number) for number in numbers]
+        else:
+            seqs = [sequence._next() for _i in range(count)]
+        # Include year and month automatically
+        current_date = fields.Date.today()
+        year = current_date.strftime("%Y")
+        month = current_date.strftime("%m")
+        return [f"{prefix}/{year}/{month}/{seq}" for seq in seqs]
 
     def action_confirm_all(self):
         """Action to confirm all data quality fields at once"""
-        for record in self:
-            record.write({
-                'name_confirmed': True,
-                'address_confirmed': True,
-                'phone_confirmed': True,
-                'service_satisfaction_confirmed': True,
-                'product_information_confirmed': True,
-            })
+        return self._confirm_fields(CONFIRMATION_FIELDS)
+
+    def _confirm_fields(self, field_names):
+        """Set the given confirmation flags on the whole recordset.
+
+        Only records still missing one of the flags are written, with a single
+        ``write`` so ``overall_score`` is recomputed in one batch and the KPI
+        targets are refreshed once per affected user.
+        """
+        field_names = [f for f in field_names if f in CONFIRMATION_FIELDS]
+        to_confirm = self.filtered(lambda r: not all(r[f] for f in field_names))
+        if field_names and to_confirm:
+            to_confirm.write(dict.fromkeys(field_names, True))
         return True
 
+    def _notify_kpi_target_update(self):
+        """Schedule the recalculation of the active KPI targets of the leads'
+        users. Users are collected for the whole transaction and recalculated
+        once each, right before it commits."""
+        user_ids = self.mapped('lead_id.user_id').ids
+        if not user_ids:
+            return
+        precommit = self.env.cr.precommit
+        if KPI_UPDATE_USERS_KEY not in precommit.data:
+            precommit.data[KPI_UPDATE_USERS_KEY] = set()
+            precommit.add(self._run_kpi_target_updates)
+        precommit.data[KPI_UPDATE_USERS_KEY].update(user_ids)
+
+    def _run_kpi_target_updates(self):
+        user_ids = self.env.cr.precommit.data.pop(KPI_UPDATE_USERS_KEY, set())
+        KpiTarget = self.env['kpi.target'].sudo()
+        for user_id in sorted(user_ids):
+            KpiTarget._update_targets_for_user(user_id, 'telemarketing.confirmation')
+        # Precommit hooks run after the final flush of the transaction
+        self.env.flush_all()
+
     @api.onchange('lead_id')
     def _onchange_lead_id(self):
         for record in self:
@@ -68,27 +125,29 @@ class TelemarketingConfirmation(models.Model):
                 # Set telemarketer to the lead's creator, not current user
                 record.telemarketer_id = record.lead_id.create_uid or self.env.user
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         # FIX: Set telemarketer_id BEFORE calling super().create()
-        if 'lead_id' in vals and 'telemarketer_id' not in vals:
-            lead = self.env['crm.lead'].browse(vals['lead_id'])
-            if lead:
-                vals['telemarketer_id'] = lead.create_uid.id
+        lead_ids = {vals['lead_id'] for vals in vals_list if vals.get('lead_id') and 'telemarketer_id' not in vals}
+        creators = {lead.id: lead.create_uid.id for lead in self.env['crm.lead'].browse(lead_ids)}
+        for vals in vals_list:
+            if vals.get('lead_id') in creators and 'telemarketer_id' not in vals:
+                vals['telemarketer_id'] = creators[vals['lead_id']]
+
+        # Reserve the sequence numbers of the whole batch at once
+        unnamed = [vals for vals in vals_list if not vals.get('name')]
+        if unnamed:
+            for vals, name in zip(unnamed, self._reserve_names(len(unnamed))):
+                vals['name'] = name
 
-        # Create the record with the properly set telemarketer_id
-        record = super().create(vals)
+        # Create the records with the properly set telemarketer_id
+        records = super().create(vals_list)
 
-        # Update KPI targets after creation
-        if record.lead_id and record.lead_id.user_id:
-            self.env['kpi.target'].sudo()._update_targets_for_user(record.lead_id.user_id.id,
-                                                                   'telemarketing.confirmation')
-        return record
+        # Schedule the KPI target update of the leads' users
+        records._notify_kpi_target_update()
+        return records
 
     def write(self, vals):
         res = super().write(vals)
-        for rec in self:
-            if rec.lead_id and rec.lead_id.user_id:
-                self.env['kpi.target'].sudo()._update_targets_for_user(rec.lead_id.user_id.id,
-                                                                       'telemarketing.confirmation')
-        return res
\ No newline at end of file
+        self._notify_kpi_target_update()
+        return res
@@ -0,0 +1,52 @@
+from odoo import fields
+from odoo.tests import common
+
+
+class TestTelemarketingConfirmation(common.TransactionCase):
+    """KPI target updates scheduled by telemarketing confirmations."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = cls.env["res.users"].create(
+            {"name": "Telemarketer", "login": "kpi_telemarketer"}
+        )
+        cls.lead = cls.env["crm.lead"].create(
+            {"name": "Lead #1", "user_id": cls.user.id}
+        )
+        cls.kpi_leads = cls.env["kpi.definition"].create(
+            {"name": "Leads Registered", "kpi_type": "leads_registered"}
+        )
+        today = fields.Date.today()
+        cls.target = cls.env["kpi.target"].create(
+            {
+                "user_id": cls.user.id,
+                "date_start": today,
+                "date_end": today,
+                "target_line_ids": [
+                    (0, 0, {"kpi_definition_id": cls.kpi_leads.id, "target_value": 10})
+                ],
+            }
+        )
+        cls.line = cls.target.target_line_ids
+
+    def _read_actual_value(self):
+        # Straight from the table: only what the hook flushed counts
+        self.env.cr.execute(
+            "SELECT actual_value FROM kpi_target_line WHERE id = %s", (self.line.id,)
+        )
+        return self.env.cr.fetchone()[0]
+
+    def test_kpi_update_flushed_before_commit(self):
+        """The precommit recalculation reaches the database."""
+        self.env.flush_all()
+        self.assertEqual(self._read_actual_value(), 0)
+
+        self.env["telemarketing.confirmation"].create({"lead_id": self.lead.id})
+        self.env.cr.precommit.run()
+
+        self.assertEqual(self._read_actual_value(), 1)
+        self.env.cr.execute(
+            "SELECT last_computed_date FROM kpi_target WHERE id = %s", (self.target.id,)
+        )
+        self.assertTrue(self.env.cr.fetchone()[0])
@@ -0,0 +1 @@
+from . import telemarketing_confirmation_wizard
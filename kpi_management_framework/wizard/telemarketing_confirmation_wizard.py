@@ -0,0 +1,36 @@
+from odoo import api, fields, models
+
+from ..models.telemarketing_confirmation import CONFIRMATION_FIELDS
+
+
+class TelemarketingConfirmationWizard(models.TransientModel):
+    _name = 'telemarketing.confirmation.wizard'
+    _description = 'Bulk Telemarketing Confirmation'
+
+    confirmation_ids = fields.Many2many('telemarketing.confirmation', string='Confirmations', required=True)
+    confirmation_count = fields.Integer(compute='_compute_confirmation_count')
+
+    name_confirmed = fields.Boolean(default=True)
+    address_confirmed = fields.Boolean(default=True)
+    phone_confirmed = fields.Boolean(default=True)
+    service_satisfaction_confirmed = fields.Boolean(default=True)
+    product_information_confirmed = fields.Boolean(default=True)
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        if self.env.context.get('active_model') == 'telemarketing.confirmation':
+            res['confirmation_ids'] = [(6, 0, self.env.context.get('active_ids', []))]
+        return res
+
+    @api.depends('confirmation_ids')
+    def _compute_confirmation_count(self):
+        for wizard in self:
+            wizard.confirmation_count = len(wizard.confirmation_ids)
+
+    def action_confirm(self):
+        """Set the selected confirmation flags on all confirmations at once."""
+        self.ensure_one()
+        field_names = [f for f in CONFIRMATION_FIELDS if self[f]]
+        self.confirmation_ids._confirm_fields(field_names)
+        return {'type': 'ir.actions.act_window_close'}
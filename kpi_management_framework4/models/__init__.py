@@ -5,3 +5,4 @@ from . import kpi_history
 from . import crm_phonecall
 from . import crm_lead
 from . import kpi_confirmation_type
+from . import resource_calendar
@@ -36,15 +36,19 @@ class CrmPhonecall(models.Model):
             record.overall_score = score
 
     def action_confirm_all_fields(self):
-        """Sets all data quality confirmation fields to True on the phonecall record."""
-        self.ensure_one()
-        self.write({
-            'name_confirmed': True,
-            'address_confirmed': True,
-            'phone_confirmed': True,
-            'service_satisfaction_confirmed': True,
-            'product_information_confirmed': True,
-        })
+        """Sets all data quality confirmation fields to True on the phonecall records.
+
+        Works on any number of calls: the calls still missing a confirmation
+        are written at once, so ``overall_score`` is recomputed in one batch
+        and the KPI targets are refreshed once per affected user.
+        """
+        confirmation_fields = [
+            'name_confirmed', 'address_confirmed', 'phone_confirmed',
+            'service_satisfaction_confirmed', 'product_information_confirmed'
+        ]
+        to_confirm = self.filtered(lambda r: not all(r[f] for f in confirmation_fields))
+        if to_confirm:
+            to_confirm.write(dict.fromkeys(confirmation_fields, True))
         return True
 
     # Add the KPI trigger logic
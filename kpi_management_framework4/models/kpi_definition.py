@@ -22,6 +22,9 @@ class KpiDefinition(models.Model):
     kpi_type = fields.Selection([
         ('leads_registered', 'Leads Registered'),
         ('data_quality', 'Data Quality'),
+        ('calls_held', 'Calls Held'),
+        ('orders_generated', 'Orders Generated'),
+        ('revenue', 'Revenue'),
     ], string='KPI Type', required=True, default='leads_registered')
 
     # Use fields.Text to store the comma-separated values of the multi-selection widget
@@ -45,10 +45,13 @@ class KpiHistory(models.Model):
     def _get_source_document_models(self):
         """Define the models that can be referenced as source documents."""
         # 💡 FIX: Removed 'telemarketing.confirmation' from the list of valid models.
-        return [
+        source_models = [
             ('crm.lead', 'Lead/Opportunity'),
             ('crm.phonecall', 'Phone Call'),
         ]
+        if 'sale.order' in self.env:
+            source_models.append(('sale.order', 'Sales Order'))
+        return source_models
 
     def _compute_source_document(self):
         """
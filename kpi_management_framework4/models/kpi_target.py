@@ -1,5 +1,7 @@
 from odoo import fields, models, api, _
 from odoo.tools.safe_eval import safe_eval
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from datetime import timedelta
 
 import logging
@@ -79,116 +81,202 @@ class KpiTarget(models.Model):
     # KPI CALCULATION LOGIC
     # =========================================================================
 
-    def _calculate_leads_registered(self, target, kpi, history_vals_list):
-        """Calculates the count of Leads Registered and prepares history records."""
-        date_start = target.date_start
-        date_end = target.date_end
-        user = target.user_id
-
-        # Search for all leads created by the user within the target period
-        leads = self.env['crm.lead'].search([
-            ('user_id', '=', user.id),
-            ('create_date', '>=', fields.Datetime.to_datetime(date_start)),
-            ('create_date', '<=', fields.Datetime.to_datetime(date_end) + timedelta(days=1)),
-        ])
+    @api.model
+    def _get_kpi_evaluators(self):
+        """Registry of the batched KPI evaluators, keyed by ``kpi.definition.kpi_type``.
+
+        Each value is the name of a method taking the ``kpi.target.line``
+        records of that type (across any number of targets) and returning
+        ``(values, history_vals_list)`` where ``values`` maps line ids to
+        their actual value. Modules adding a KPI type extend the selection on
+        ``kpi.definition`` and register their evaluator by overriding this.
+        """
+        return {
+            'leads_registered': '_evaluate_leads_registered',
+            'data_quality': '_evaluate_data_quality',
+            'calls_held': '_evaluate_calls_held',
+            'orders_generated': '_evaluate_orders_generated',
+            'revenue': '_evaluate_revenue',
+        }
 
-        calculated_value = len(leads)
+    @api.model
+    def _get_kpi_period(self, target):
+        """Datetime bounds of the target period, end day included."""
+        return (
+            fields.Datetime.to_datetime(target.date_start),
+            fields.Datetime.to_datetime(target.date_end) + timedelta(days=1),
+        )
 
-        # Prepare history records for batch creation
-        for lead in leads:
-            history_vals_list.append({
-                'target_id': target.id,
-                'target_line_id': kpi.target_line_id.id,  # Assumes 1:1 line for the KPI
-                'kpi_definition_id': kpi.id,
+    @api.model
+    def _match_kpi_records(self, lines, model_name, date_field, domain=None, user_field='user_id'):
+        """Return ``{line_id: records}`` with the records of ``model_name``
+        belonging to each line's user and period, fetched with a single search
+        covering all the lines."""
+        model = self.env[model_name]
+        targets = lines.target_id.filtered(lambda t: t.user_id and t.date_start and t.date_end)
+        if not targets:
+            return {line.id: model for line in lines}
+
+        periods = {target.id: self._get_kpi_period(target) for target in targets}
+        records = model.search(list(domain or []) + [
+            (user_field, 'in', targets.user_id.ids),
+            (date_field, '>=', min(period[0] for period in periods.values())),
+            (date_field, '<=', max(period[1] for period in periods.values())),
+        ], order=f'{date_field}, id')
+
+        # Records are sorted by date, so each period is a slice of the user's list
+        dates_by_user = defaultdict(list)
+        ids_by_user = defaultdict(list)
+        for record in records:
+            dates_by_user[record[user_field].id].append(record[date_field])
+            ids_by_user[record[user_field].id].append(record.id)
+
+        result = {}
+        for line in lines:
+            target = line.target_id
+            if target.id not in periods:
+                result[line.id] = model
+                continue
+            date_from, date_to = periods[target.id]
+            dates = dates_by_user[target.user_id.id]
+            lo = bisect_left(dates, date_from)
+            hi = bisect_right(dates, date_to)
+            result[line.id] = model.browse(ids_by_user[target.user_id.id][lo:hi])
+        return result
+
+    def _evaluate_leads_registered(self, lines):
+        """Count of Leads Registered by the user over the target period."""
+        leads_by_line = self._match_kpi_records(lines, 'crm.lead', 'create_date')
+        values, history_vals_list = {}, []
+        for line in lines:
+            leads = leads_by_line[line.id]
+            values[line.id] = len(leads)
+            history_vals_list += [{
+                'target_id': line.target_id.id,
+                'target_line_id': line.id,
+                'kpi_definition_id': line.kpi_definition_id.id,
                 'source_document_model': 'crm.lead',
                 'source_document_id': lead.id,
                 'activity_date': lead.create_date,
                 'description': f"Lead registered: {lead.name}",
                 'data_quality_score': 0.0,
-            })
-
-        return calculated_value
-
-    def _calculate_data_quality(self, target, kpi, history_vals_list):
-        """Calculates the average Data Quality score from crm.phonecall and prepares history records."""
-        date_start = target.date_start
-        date_end = target.date_end
-        user = target.user_id
-
-        # Search for all phonecalls created by the user within the target period
-        phonecalls = self.env['crm.phonecall'].search([
-            ('user_id', '=', user.id),
-            ('create_date', '>=', fields.Datetime.to_datetime(date_start)),
-            ('create_date', '<=', fields.Datetime.to_datetime(date_end) + timedelta(days=1)),
-        ])
-
-        calculated_value = 0.0
-
-        if phonecalls:
+            } for lead in leads]
+        return values, history_vals_list
+
+    def _evaluate_data_quality(self, lines):
+        """Average Data Quality score of the user's phone calls over the target period."""
+        calls_by_line = self._match_kpi_records(lines, 'crm.phonecall', 'create_date')
+        values, history_vals_list = {}, []
+        for line in lines:
+            phonecalls = calls_by_line[line.id]
             # The actual_value is the average of the overall_score from crm.phonecall
-            total_score = sum(phonecall.overall_score for phonecall in phonecalls)
-            calculated_value = total_score / len(phonecalls)
-
-            # Prepare history records for batch creation
-            for phonecall in phonecalls:
-                history_vals_list.append({
-                    'target_id': target.id,
-                    'target_line_id': kpi.target_line_id.id,
-                    'kpi_definition_id': kpi.id,
-                    'source_document_model': 'crm.phonecall',
-                    'source_document_id': phonecall.id,
-                    'activity_date': phonecall.create_date,
-                    'description': f"Data Quality Score for Phone Call: {phonecall.name}",
-                    'data_quality_score': phonecall.overall_score,
-                    'data_quality_type': 'all_confirmations',
-                    # FIX: Use 'all_confirmations' as the type for overall score
-                })
-
-        return calculated_value
+            values[line.id] = sum(phonecalls.mapped('overall_score')) / len(phonecalls) if phonecalls else 0.0
+            history_vals_list += [{
+                'target_id': line.target_id.id,
+                'target_line_id': line.id,
+                'kpi_definition_id': line.kpi_definition_id.id,
+                'source_document_model': 'crm.phonecall',
+                'source_document_id': phonecall.id,
+                'activity_date': phonecall.create_date,
+                'description': f"Data Quality Score for Phone Call: {phonecall.name}",
+                'data_quality_score': phonecall.overall_score,
+                'data_quality_type': 'all_confirmations',
+            } for phonecall in phonecalls]
+        return values, history_vals_list
+
+    def _evaluate_calls_held(self, lines):
+        """Count of phone calls held by the user over the target period."""
+        calls_by_line = self._match_kpi_records(lines, 'crm.phonecall', 'date', [('state', '=', 'done')])
+        values, history_vals_list = {}, []
+        for line in lines:
+            phonecalls = calls_by_line[line.id]
+            values[line.id] = len(phonecalls)
+            history_vals_list += [{
+                'target_id': line.target_id.id,
+                'target_line_id': line.id,
+                'kpi_definition_id': line.kpi_definition_id.id,
+                'source_document_model': 'crm.phonecall',
+                'source_document_id': phonecall.id,
+                'activity_date': phonecall.date,
+                'description': f"Phone call held: {phonecall.name}",
+            } for phonecall in phonecalls]
+        return values, history_vals_list
+
+    def _evaluate_sale_orders(self, lines, measure):
+        """Shared evaluator for the sales KPIs, ``measure(orders)`` giving the value."""
+        if 'sale.order' not in self.env:
+            return dict.fromkeys(lines.ids, 0.0), []
+        orders_by_line = self._match_kpi_records(
+            lines, 'sale.order', 'date_order', [('state', 'in', ('sale', 'done'))]
+        )
+        values, history_vals_list = {}, []
+        for line in lines:
+            orders = orders_by_line[line.id]
+            values[line.id] = measure(orders)
+            history_vals_list += [{
+                'target_id': line.target_id.id,
+                'target_line_id': line.id,
+                'kpi_definition_id': line.kpi_definition_id.id,
+                'source_document_model': 'sale.order',
+                'source_document_id': order.id,
+                'activity_date': order.date_order,
+                'description': f"Sales order confirmed: {order.name} ({order.amount_untaxed:.2f})",
+            } for order in orders]
+        return values, history_vals_list
+
+    def _evaluate_orders_generated(self, lines):
+        """Count of sales orders confirmed by the user over the target period."""
+        return self._evaluate_sale_orders(lines, len)
+
+    def _evaluate_revenue(self, lines):
+        """Untaxed amount of the sales orders confirmed by the user over the target period."""
+        return self._evaluate_sale_orders(lines, lambda orders: sum(orders.mapped('amount_untaxed')))
 
     def _recalculate_values(self):
-        """Recalculate all KPI values for the target document (can be called on multiple records)."""
-        # self.ensure_one() # REMOVED: Allows calling on a record set (e.g., from cron or auto-update)
-        KpiHistory = self.env['kpi.history']
-
-        for target in self:
-            _logger.info(f"Recalculating KPI Target: {target.name} for user {target.user_id.name}")
-
-            # Clear all old history for this entire target document
-            target.history_ids.unlink()
-            history_vals_list = []
-
-            for line in target.target_line_ids:
-                kpi = line.kpi_definition_id
-                _logger.info(f"Processing KPI line: {kpi.name} with type: {kpi.kpi_type}")
+        """Recalculate all KPI values for the target documents (can be called on multiple records).
 
-                kpi.target_line_id = line
-
-                calculated_value = 0.0
-
-                if kpi.kpi_type == 'leads_registered':
-                    calculated_value = self._calculate_leads_registered(target, kpi, history_vals_list)
-                elif kpi.kpi_type == 'data_quality':
-                    calculated_value = self._calculate_data_quality(target, kpi, history_vals_list)
-
-                # Update the line with calculated value
-                line.actual_value = calculated_value
-                _logger.info(f"KPI '{kpi.name}' calculated value: {calculated_value}")
-
-                kpi.target_line_id = False
-
-
-            # Create all history records in one batch
-            if history_vals_list:
-                KpiHistory.create(history_vals_list)
-                _logger.info(f"Created {len(history_vals_list)} history records")
-
-            # Trigger overall achievement computation
-            target._compute_overall_achievement()
-
-            # Update the master record's timestamp
-            target.last_computed_date = fields.Datetime.now()
-            _logger.info(f"Completed recalculation for KPI Target '{target.name}'.")
+        Lines are grouped by KPI type and each evaluator runs once for the
+        whole recordset; actual values are written with one write per
+        distinct value and the history is recreated with a single create.
+        """
+        if not self:
+            return
+        _logger.info(f"Recalculating {len(self)} KPI Target(s)")
+
+        # Clear all old history for these target documents
+        self.history_ids.unlink()
+
+        evaluators = self._get_kpi_evaluators()
+        lines_by_type = defaultdict(list)
+        for line in self.target_line_ids:
+            lines_by_type[line.kpi_definition_id.kpi_type].append(line.id)
+
+        values = {}
+        history_vals_list = []
+        KpiTargetLine = self.env['kpi.target.line']
+        for kpi_type, line_ids in lines_by_type.items():
+            evaluator = evaluators.get(kpi_type)
+            if not evaluator:
+                _logger.warning(f"No KPI evaluator registered for type '{kpi_type}'")
+                continue
+            type_values, type_history = getattr(self, evaluator)(KpiTargetLine.browse(line_ids))
+            values.update(type_values)
+            history_vals_list += type_history
+
+        # Update the lines with the calculated values
+        line_ids_by_value = defaultdict(list)
+        for line in self.target_line_ids:
+            line_ids_by_value[values.get(line.id, 0.0)].append(line.id)
+        for value, line_ids in line_ids_by_value.items():
+            KpiTargetLine.browse(line_ids).write({'actual_value': value})
+
+        # Create all history records in one batch
+        if history_vals_list:
+            self.env['kpi.history'].create(history_vals_list)
+            _logger.info(f"Created {len(history_vals_list)} history records")
+
+        # Update the master records' timestamp
+        self.write({'last_computed_date': fields.Datetime.now()})
 
     # Public action for the button (calls the private calculation method)
     # def action_recalculate_values(self):
@@ -258,30 +346,26 @@ class KpiTarget(models.Model):
 
     @api.depends('date_start', 'date_end', 'user_id.resource_calendar_id')
     def _compute_working_days(self):
+        # Targets sharing a calendar and a period (e.g. monthly targets of a
+        # whole sales floor) are computed once; the calendar memoises the
+        # result until its attendances or leaves change.
+        targets_by_key = defaultdict(list)
         for rec in self:
             calendar = rec.user_id.resource_calendar_id
 
             # Check for all required fields
             if rec.date_start and rec.date_end and calendar:
-
-                # Convert Date fields to Datetime in UTC for calendar methods
-                start_dt = fields.Datetime.to_datetime(rec.date_start)
-                # To include the entire end day, add a full day to end_dt
-                end_dt = fields.Datetime.to_datetime(rec.date_end) + timedelta(days=1)
-
-                # Use the standard Odoo resource.calendar method
-                # to get the duration data (including days and hours)
-                duration_data = calendar.get_work_duration_data(
-                    start_dt,
-                    end_dt,
-                    compute_leaves=True
-                )
-
-                # 'days' is a float representing the working time.
-                # We round it to the nearest integer for 'working_days'
-                rec.working_days = round(duration_data.get('days', 0.0))
+                targets_by_key[(calendar, rec.date_start, rec.date_end)].append(rec.id)
             else:
                 rec.working_days = 0
+
+        calendars = self.env['resource.calendar'].union(*(key[0] for key in targets_by_key))
+        versions = calendars._get_working_days_versions()
+        for (calendar, date_start, date_end), target_ids in targets_by_key.items():
+            self.browse(target_ids).working_days = calendar._get_working_days(
+                date_start, date_end, versions[calendar.id]
+            )
+
     @api.depends('user_id', 'date_start', 'date_end')
     def _compute_name(self):
         for record in self:
@@ -355,9 +439,8 @@ class KpiTarget(models.Model):
         _logger.info("Starting nightly KPI update cron job...")
         # Find active targets
         active_targets = self.search([('date_end', '>=', fields.Date.today()), ('state', '=', 'active')])
-        # Call the private calculation method on all active targets
-        for target in active_targets:
-            target._recalculate_values()
+        # Call the private calculation method on all active targets at once
+        active_targets._recalculate_values()
         _logger.info("Finished nightly KPI update cron job.")
 
     @api.model
@@ -373,20 +456,5 @@ class KpiTarget(models.Model):
             ('state', '=', 'active'),
         ])
 
-        if active_targets:
-            for target in active_targets:
-                target._recalculate_values()
-
-
-# =============================================================================
-# TEMPORARY FIELD ON KPI DEFINITION TO PASS TARGET LINE ID
-# =============================================================================
-
-# This allows the helper functions in kpi.target to access the target_line_id
-# without changing the function signature across multiple calls.
-# This should be implemented in kpi_definition.py
-class KpiDefinition(models.Model):
-    _inherit = 'kpi.definition'
+        active_targets._recalculate_values()
 
-    # Temporary field to hold the target line record for calculation history
-    target_line_id = fields.Many2one('kpi.target.line', string='Current Target Line', store=False)
\ No newline at end of file
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from odoo import api, fields, models, tools
+
+
+class ResourceCalendar(models.Model):
+    _inherit = 'resource.calendar'
+
+    # Bumped from a database sequence whenever the calendar, its attendances
+    # or its leaves change: the cached working days are keyed by it, so no
+    # cache ever needs to be cleared
+    working_days_version = fields.Integer(readonly=True, copy=False, default=0)
+
+    def init(self):
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS resource_calendar_working_days_version_seq")
+
+    def _bump_working_days_version(self):
+        """Give the calendars a new version, unique even across rolled back
+        transactions since sequences are not transactional."""
+        if not self.ids:
+            return
+        self.env.cr.execute(
+            "UPDATE resource_calendar SET working_days_version = nextval('resource_calendar_working_days_version_seq') "
+            "WHERE id IN %s",
+            (tuple(self.ids),),
+        )
+        self.invalidate_recordset(['working_days_version'])
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._bump_working_days_version()
+        return res
+
+    def _get_working_days_versions(self):
+        """Return ``{calendar_id: version}`` for the calendars in ``self``."""
+        return {calendar.id: calendar.working_days_version for calendar in self}
+
+    def _get_working_days(self, date_start, date_end, version=None):
+        """Number of working days between two dates (both included), leaves
+        deducted. Values are memoised per (calendar, range, version)."""
+        self.ensure_one()
+        if version is None:
+            version = self._get_working_days_versions()[self.id]
+        return self._get_working_days_cached(date_start, date_end, version)
+
+    @tools.ormcache('self.id', 'date_start', 'date_end', 'version')
+    def _get_working_days_cached(self, date_start, date_end, version):
+        # To include the entire end day, add a full day to the end datetime
+        duration_data = self.get_work_duration_data(
+            fields.Datetime.to_datetime(date_start),
+            fields.Datetime.to_datetime(date_end) + timedelta(days=1),
+            compute_leaves=True,
+        )
+        # 'days' is a float representing the working time.
+        # We round it to the nearest integer for 'working_days'
+        return round(duration_data.get('days', 0.0))
+
+
+class ResourceCalendarAttendance(models.Model):
+    _inherit = 'resource.calendar.attendance'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.calendar_id._bump_working_days_version()
+        return records
+
+    def write(self, vals):
+        calendars = self.calendar_id
+        res = super().write(vals)
+        (calendars | self.calendar_id)._bump_working_days_version()
+        return res
+
+    def unlink(self):
+        calendars = self.calendar_id
+        res = super().unlink()
+        calendars.exists()._bump_working_days_version()
+        return res
+
+
+class ResourceCalendarLeaves(models.Model):
+    _inherit = 'resource.calendar.leaves'
+
+    def _get_working_days_calendars(self):
+        """Calendars whose working days depend on these leaves: leaves
+        without calendar apply to every calendar."""
+        if any(not leave.calendar_id for leave in self):
+            return self.env['resource.calendar'].sudo().with_context(active_test=False).search([])
+        return self.calendar_id
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._get_working_days_calendars()._bump_working_days_version()
+        return records
+
+    def write(self, vals):
+        calendars = self._get_working_days_calendars()
+        res = super().write(vals)
+        (calendars | self._get_working_days_calendars())._bump_working_days_version()
+        return res
+
+    def unlink(self):
+        calendars = self._get_working_days_calendars()
+        res = super().unlink()
+        calendars.exists()._bump_working_days_version()
+        return res
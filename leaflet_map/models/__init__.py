@@ -1,2 +1,3 @@
 from . import ir_actions
 from . import ir_ui_view
+from . import base
@@ -0,0 +1,91 @@
+from odoo import api, models
+from odoo.tools import SQL
+
+# Grid cells per 256px map tile: ~64px wide clusters on screen.
+LMAP_CELLS_PER_TILE = 4
+# From this zoom level on, records are always returned individually.
+LMAP_RECORDS_MIN_ZOOM = 16
+# Below that zoom, individual records are returned when the viewport holds at most this many.
+LMAP_RECORDS_LIMIT = 300
+
+
+class Base(models.AbstractModel):
+    _inherit = "base"
+
+    def _lmap_query(self, domain, lat_field, lng_field, bounds=None):
+        """Return the ORM query of the geocoded records matching ``domain``
+        (record rules applied), optionally restricted to ``bounds``."""
+        for fname in (lat_field, lng_field):
+            field = self._fields.get(fname)
+            if not field or not field.store or field.type != "float":
+                raise ValueError(f"{self._name}.{fname} is not a stored float field")
+        self.check_access_rights("read")
+        self.flush_model()
+        query = self._where_calc(domain)
+        self._apply_ir_rules(query, "read")
+        lat = SQL.identifier(self._table, lat_field)
+        lng = SQL.identifier(self._table, lng_field)
+        # Leads that were never geocoded keep 0.0 in both coordinates
+        query.add_where(SQL("%s IS NOT NULL AND %s IS NOT NULL AND (%s != 0 OR %s != 0)", lat, lng, lat, lng))
+        if bounds:
+            query.add_where(SQL("%s BETWEEN %s AND %s", lat, bounds["south"], bounds["north"]))
+            if bounds["west"] <= bounds["east"]:
+                query.add_where(SQL("%s BETWEEN %s AND %s", lng, bounds["west"], bounds["east"]))
+            else:
+                # Viewport crossing the antimeridian
+                query.add_where(SQL("(%s >= %s OR %s <= %s)", lng, bounds["west"], lng, bounds["east"]))
+        return query, lat, lng
+
+    @api.model
+    def lmap_get_bounds(self, domain=None, lat_field="latitude", lng_field="longitude"):
+        """Bounding box of the geocoded records matching ``domain``, used by
+        the lmap view to frame the map before loading anything."""
+        query, lat, lng = self._lmap_query(domain or [], lat_field, lng_field)
+        self.env.cr.execute(query.select(
+            SQL("MIN(%s), MIN(%s), MAX(%s), MAX(%s)", lat, lng, lat, lng)
+        ))
+        south, west, north, east = self.env.cr.fetchone()
+        if south is None:
+            return False
+        return {"south": south, "west": west, "north": north, "east": east}
+
+    @api.model
+    def lmap_fetch(self, domain, bounds, zoom, fields=None, lat_field="latitude", lng_field="longitude"):
+        """Data of the lmap view for one viewport.
+
+        Records inside ``bounds`` are aggregated in SQL over a lat/lng grid
+        whose cell size follows ``zoom``. Individual records (``fields`` read)
+        are only returned at high zoom or when few enough are visible.
+
+        :return: ``{"type": "clusters", "clusters": [...]}`` with ``lat``,
+            ``lng`` (centroid), ``count`` and ``id`` (for single-record cells),
+            or ``{"type": "records", "records": [...]}``
+        """
+        zoom = int(zoom)
+        query, lat, lng = self._lmap_query(domain or [], lat_field, lng_field, bounds)
+        if zoom < LMAP_RECORDS_MIN_ZOOM:
+            cell = 360.0 / (2 ** zoom) / LMAP_CELLS_PER_TILE
+            self.env.cr.execute(SQL(
+                """SELECT COUNT(*), AVG(%s), AVG(%s), MIN(%s)
+                     FROM %s
+                    WHERE %s
+                 GROUP BY FLOOR(%s / %s), FLOOR(%s / %s)""",
+                lat, lng, SQL.identifier(self._table, "id"),
+                query.from_clause,
+                query.where_clause,
+                lat, cell, lng, cell,
+            ))
+            rows = self.env.cr.fetchall()
+            if sum(row[0] for row in rows) > LMAP_RECORDS_LIMIT:
+                return {
+                    "type": "clusters",
+                    "clusters": [
+                        {"count": count, "lat": avg_lat, "lng": avg_lng, "id": min_id if count == 1 else False}
+                        for count, avg_lat, avg_lng, min_id in rows
+                    ],
+                }
+        query.limit = LMAP_RECORDS_LIMIT * 10
+        self.env.cr.execute(query.select(SQL.identifier(self._table, "id")))
+        ids = [row[0] for row in self.env.cr.fetchall()]
+        fields = list({*(fields or ["display_name"]), lat_field, lng_field})
+        return {"type": "records", "records": self.browse(ids).read(fields)}
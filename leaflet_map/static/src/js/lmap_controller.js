@@ -10,16 +10,21 @@ export class LeafletMapController extends Component {
         const arch = this.props.arch;
         const attrs = arch?.attributes;
 
-        this.mapProps = {
-            model: attrs?.getNamedItem("model")?.value || "crm.lead",
+        this.archProps = {
+            model: attrs?.getNamedItem("model")?.value || this.props.resModel || "crm.lead",
+            latField: attrs?.getNamedItem("lat-field")?.value || "latitude",
+            lngField: attrs?.getNamedItem("lng-field")?.value || "longitude",
             fields: attrs?.getNamedItem("fields")?.value?.split(",") || ["id","name","partner_name","latitude","longitude"],
             nameField: attrs?.getNamedItem("name-field")?.value || "partner_name",
             defaultLat: parseFloat(attrs?.getNamedItem("default-lat")?.value) || 8.998093,
             defaultLng: parseFloat(attrs?.getNamedItem("default-lng")?.value) || 38.777651,
             defaultZoom: parseInt(attrs?.getNamedItem("default-zoom")?.value) || 12,
         };
+    }
 
-        console.log("Controller mapProps:", this.mapProps);
+    // The domain follows the search panel, so it is read on every render
+    get mapProps() {
+        return { ...this.archProps, domain: this.props.domain || [] };
     }
 
 
@@ -1,7 +1,8 @@
 /** @odoo-module */
-import { Component, onWillStart, useRef, onMounted } from "@odoo/owl";
+import { Component, onWillStart, useRef, onMounted, onWillUpdateProps, onWillUnmount } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
 import { loadJS, loadCSS } from "@web/core/assets";
+import { debounce } from "@web/core/utils/timing";
 
 export class LeafletMapRenderer extends Component {
     static template = "leaflet_map.MapRenderer";
@@ -10,6 +11,9 @@ export class LeafletMapRenderer extends Component {
     static props = {
         model: String,
         fields: { type: Array },
+        domain: { type: Array, optional: true },
+        latField: { type: String, optional: true },
+        lngField: { type: String, optional: true },
         nameField: { type: String, optional: true },
         defaultLat: { type: Number, optional: true, default: 8.998093 },
         defaultLng: { type: Number, optional: true, default: 38.777651 },
@@ -19,51 +23,31 @@ export class LeafletMapRenderer extends Component {
     setup() {
         this.root = useRef("map"); // container ref
         this.orm = useService("orm"); // Odoo ORM service
-        this.records = []; // will hold fetched records
         this.map = null;
+        this.layer = null; // markers/clusters of the current viewport
+        this.initialBounds = false;
+        this.fetchId = 0; // discards responses of superseded requests
 
-        // Function to render markers
-        const renderMarkers = () => {
-            if (!this.map) return;
-            this.records.forEach((rec) => {
-                if (rec.latitude && rec.longitude) {
-                    const marker = L.marker([rec.latitude, rec.longitude]).addTo(this.map);
-                    const label = this.props.nameField ? rec[this.props.nameField] : rec.name || "No Name";
-                    marker.bindTooltip(`<b>${label}</b>`, { permanent: true, direction: "top", offset: [0, -10] });
-                    marker.bindPopup(`<b>${label}</b><br/>Lat: ${rec.latitude}, Lng: ${rec.longitude}`);
-                }
-            });
-        };
+        // Refetch the visible area once panning/zooming settles
+        this.debouncedFetch = debounce(() => this.fetchViewport(), 300);
 
         // Load Leaflet CSS and JS before rendering
         onWillStart(async () => {
             await loadCSS("https://unpkg.com/leaflet@1.9.4/dist/leaflet.css");
             await loadJS("https://unpkg.com/leaflet@1.9.4/dist/leaflet.js");
-
-            // Fetch records from Odoo model if props are provided
-            if (this.props.model && this.props.fields.length) {
-                this.records = await this.orm.searchRead(
-                    this.props.model,
-                    [],
-                    this.props.fields
-                );
-            }
+            this.initialBounds = await this.fetchBounds(this.props);
         });
 
-        // Initialize map and markers after component is mounted
+        // Initialize map after component is mounted
         onMounted(() => {
-            let initLat = this.props.defaultLat;
-            let initLng = this.props.defaultLng;
-
-            // Center map on first record if available
-            const first = this.records.find(r => r.latitude && r.longitude);
-            if (first) {
-                initLat = first.latitude;
-                initLng = first.longitude;
-            }
-
             // Initialize Leaflet map
-            this.map = L.map(this.root.el).setView([initLat, initLng], this.props.defaultZoom);
+            this.map = L.map(this.root.el).setView(
+                [this.props.defaultLat, this.props.defaultLng],
+                this.props.defaultZoom
+            );
+            if (this.initialBounds) {
+                this.fitBounds(this.initialBounds);
+            }
 
             // Add OpenStreetMap tiles
             L.tileLayer("https://tile.openstreetmap.org/{z}/{x}/{y}.png", {
@@ -71,8 +55,116 @@ export class LeafletMapRenderer extends Component {
                 attribution: '&copy; OpenStreetMap contributors',
             }).addTo(this.map);
 
-            // Add markers for each record
-            renderMarkers();
+            this.layer = L.layerGroup().addTo(this.map);
+            this.map.on("moveend", this.debouncedFetch);
+            this.fetchViewport();
+        });
+
+        // The search panel changed the domain: reframe and reload
+        onWillUpdateProps(async (nextProps) => {
+            if (JSON.stringify(nextProps.domain) === JSON.stringify(this.props.domain)) {
+                return;
+            }
+            const bounds = await this.fetchBounds(nextProps);
+            if (bounds) {
+                this.fitBounds(bounds);
+            }
+            this.debouncedFetch();
+        });
+
+        onWillUnmount(() => {
+            this.debouncedFetch.cancel();
+            if (this.map) {
+                this.map.off("moveend", this.debouncedFetch);
+                this.map.remove();
+            }
+        });
+    }
+
+    fetchBounds(props) {
+        return this.orm.call(props.model, "lmap_get_bounds", [], {
+            domain: props.domain || [],
+            lat_field: props.latField || "latitude",
+            lng_field: props.lngField || "longitude",
         });
     }
+
+    fitBounds(bounds) {
+        this.map.fitBounds(
+            [[bounds.south, bounds.west], [bounds.north, bounds.east]],
+            { maxZoom: this.props.defaultZoom }
+        );
+    }
+
+    /**
+     * Viewport bounds normalised to [-180, 180] longitudes; west > east
+     * means the viewport crosses the antimeridian.
+     */
+    getViewportBounds() {
+        const bounds = this.map.getBounds();
+        const wrap = (lng) => ((((lng + 180) % 360) + 360) % 360) - 180;
+        let west = bounds.getWest();
+        let east = bounds.getEast();
+        if (east - west >= 360) {
+            west = -180;
+            east = 180;
+        } else {
+            west = wrap(west);
+            east = wrap(east);
+        }
+        return {
+            south: Math.max(bounds.getSouth(), -90),
+            north: Math.min(bounds.getNorth(), 90),
+            west,
+            east,
+        };
+    }
+
+    async fetchViewport() {
+        if (!this.map) return;
+        const fetchId = ++this.fetchId;
+        const result = await this.orm.call(this.props.model, "lmap_fetch", [], {
+            domain: this.props.domain || [],
+            bounds: this.getViewportBounds(),
+            zoom: this.map.getZoom(),
+            fields: this.props.fields,
+            lat_field: this.props.latField || "latitude",
+            lng_field: this.props.lngField || "longitude",
+        });
+        if (fetchId !== this.fetchId || !this.map) return;
+        this.layer.clearLayers();
+        if (result.type === "clusters") {
+            this.renderClusters(result.clusters);
+        } else {
+            this.renderMarkers(result.records);
+        }
+    }
+
+    renderClusters(clusters) {
+        for (const cluster of clusters) {
+            const size = 24 + Math.min(Math.round(Math.log10(cluster.count) * 10), 30);
+            const icon = L.divIcon({
+                html: `<div style="width:${size}px;height:${size}px;line-height:${size}px;border-radius:50%;background:rgba(54,162,235,0.75);color:#fff;text-align:center;font-weight:bold;">${cluster.count}</div>`,
+                className: "o_lmap_cluster",
+                iconSize: [size, size],
+            });
+            const marker = L.marker([cluster.lat, cluster.lng], { icon }).addTo(this.layer);
+            // Zoom in on the cluster, the next fetch splits it up
+            marker.on("click", () => this.map.setView([cluster.lat, cluster.lng], this.map.getZoom() + 2));
+        }
+    }
+
+    renderMarkers(records) {
+        const latField = this.props.latField || "latitude";
+        const lngField = this.props.lngField || "longitude";
+        for (const rec of records) {
+            const lat = rec[latField];
+            const lng = rec[lngField];
+            if (!lat && !lng) continue;
+            const marker = L.marker([lat, lng]).addTo(this.layer);
+            const label = (this.props.nameField ? rec[this.props.nameField] : rec.name) || "No Name";
+            marker.bindTooltip(`<b>${label}</b>`, { permanent: true, direction: "top", offset: [0, -10] });
+            marker.bindPopup(`<b>${label}</b><br/>Lat: ${lat}, Lng: ${lng}`);
+        }
+    }
 }
@@ -13,8 +13,10 @@ class IrHttp(models.AbstractModel):
     def session_info(self):
         result = super(IrHttp, self).session_info()
         if request.env.user._is_internal():
-            for company in request.env.user.company_ids.with_context(bin_size=True):
-                result['user_companies']['allowed_companies'][company.id].update({
-                    'has_appsbar_image': bool(company.appbar_image),
-                })
+            allowed_companies = result['user_companies']['allowed_companies']
+            image_flags = request.env['res.company'].sudo()._get_session_image_flags(
+                tuple(sorted(request.env.user.company_ids.ids))
+            )
+            for company_id, flags in image_flags.items():
+                allowed_companies[company_id].update(flags)
         return result
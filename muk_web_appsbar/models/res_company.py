@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import api, models, fields, tools
 
 
 class ResCompany(models.Model):
@@ -13,3 +13,56 @@ class ResCompany(models.Model):
         string='Apps Menu Footer Image',
         attachment=True
     )
+
+    #----------------------------------------------------------
+    # Helper
+    #----------------------------------------------------------
+
+    @api.model
+    def _get_session_image_fields(self):
+        # image fields flagged in the session info as
+        # {field name: session info key}
+        return {
+            'appbar_image': 'has_appsbar_image',
+        }
+
+    @api.model
+    @tools.ormcache('company_ids')
+    def _get_session_image_flags(self, company_ids):
+        # one attachment query for all the companies and images,
+        # cached until one of the images is written
+        image_fields = self._get_session_image_fields()
+        flags = {
+            company_id: dict.fromkeys(image_fields.values(), False)
+            for company_id in company_ids
+        }
+        if company_ids:
+            self.env['ir.attachment'].flush_model(
+                ['res_model', 'res_field', 'res_id']
+            )
+            self.env.cr.execute("""
+                SELECT res_id, res_field
+                  FROM ir_attachment
+                 WHERE res_model = 'res.company'
+                   AND res_field IN %s
+                   AND res_id IN %s
+            """, [tuple(image_fields), tuple(company_ids)])
+            for company_id, field in self.env.cr.fetchall():
+                flags[company_id][image_fields[field]] = True
+        return flags
+
+    #----------------------------------------------------------
+    # ORM
+    #----------------------------------------------------------
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        image_fields = self._get_session_image_fields()
+        if any(image_fields.keys() & vals.keys() for vals in vals_list):
+            self.env.registry.clear_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if self._get_session_image_fields().keys() & vals.keys():
+            self.env.registry.clear_cache()
+        return super().write(vals)
@@ -1,12 +1,30 @@
 import re
 import base64
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.tools import misc
 
 from odoo.addons.base.models.assetsbundle import EXTENSIONS
 
 
+COLOR_VARIABLE_REGEX = re.compile(r'\$mk_(\w+)\:?\s(.*?);')
+
+
+def tokenize_color_variables(content):
+    # splits the asset into literal parts and color values, returns
+    # the parts and the indexes of the values of each variable
+    parts, slots, position = [], {}, 0
+    for match in COLOR_VARIABLE_REGEX.finditer(content):
+        parts.append(content[position:match.start(2)])
+        slots.setdefault(match.group(1), []).append(len(parts))
+        parts.append(match.group(2))
+        position = match.end(2)
+    parts.append(content[position:])
+    return tuple(parts), {
+        name: tuple(indexes) for name, indexes in slots.items()
+    }
+
+
 class ScssEditor(models.AbstractModel):
     
     _inherit = 'web_editor.assets'
@@ -27,6 +45,26 @@ class ScssEditor(models.AbstractModel):
             ('path', 'like', custom_url)
         ])
 
+    @api.model
+    def _get_colors_checksum(self, url, bundle):
+        # identifies the content read by _get_colors_from_url, the
+        # checksum of the customized attachment or False for the file
+        custom_url = self._make_custom_asset_url(url, bundle)
+        url_info = self._get_data_from_url(custom_url)
+        if url_info['customized']:
+            attachment = self._get_colors_attachment(
+                custom_url
+            )
+            if attachment:
+                return attachment[:1].checksum
+        return False
+
+    @api.model
+    @tools.ormcache('url', 'bundle', 'checksum')
+    def _get_color_tokens(self, url, bundle, checksum):
+        content = self._get_colors_from_url(url, bundle)
+        return tokenize_color_variables(content.decode('utf-8'))
+
     @api.model
     def _get_colors_from_url(self, url, bundle):
         custom_url = self._make_custom_asset_url(url, bundle)
@@ -45,19 +83,29 @@ class ScssEditor(models.AbstractModel):
         return value and value.group(1)
 
     def _get_color_variables(self, content, variables):
+        return self._get_token_color_variables(
+            tokenize_color_variables(content), variables
+        )
+
+    def _replace_color_variables(self, content, variables):
+        return self._replace_token_color_variables(
+            tokenize_color_variables(content), variables
+        )
+
+    def _get_token_color_variables(self, tokens, variables):
+        parts, slots = tokens
         return {
-            var: self._get_color_variable(content, var) 
+            var: parts[slots[var][0]] if var in slots else None
             for var in variables
         }
 
-    def _replace_color_variables(self, content, variables):
+    def _replace_token_color_variables(self, tokens, variables):
+        parts, slots = tokens
+        parts = list(parts)
         for variable in variables:
-            content = re.sub(
-                fr'{variable["name"]}\:?\s(.*?);', 
-                f'{variable["name"]}: {variable["value"]};', 
-                content
-            )
-        return content
+            for index in slots.get(variable['name'], ()):
+                parts[index] = str(variable['value'])
+        return ''.join(parts)
 
     @api.model
     def _save_color_asset(self, url, bundle, content):
@@ -105,15 +153,19 @@ class ScssEditor(models.AbstractModel):
     # ----------------------------------------------------------
 
     def get_color_variables_values(self, url, bundle, variables):
-        content = self._get_colors_from_url(url, bundle)
-        return self._get_color_variables(
-            content.decode('utf-8'), variables
+        tokens = self._get_color_tokens(
+            url, bundle, self._get_colors_checksum(url, bundle)
         )
+        return self._get_token_color_variables(tokens, variables)
     
     def replace_color_variables_values(self, url, bundle, variables):
-        original = self._get_colors_from_url(url, bundle).decode('utf-8')
-        content = self._replace_color_variables(original, variables)
-        self._save_color_asset(url, bundle, content)
+        tokens = self._get_color_tokens(
+            url, bundle, self._get_colors_checksum(url, bundle)
+        )
+        original = ''.join(tokens[0])
+        content = self._replace_token_color_variables(tokens, variables)
+        if content != original:
+            self._save_color_asset(url, bundle, content)
 
     def reset_color_asset(self, url, bundle):
         custom_url = self._make_custom_asset_url(url, bundle)
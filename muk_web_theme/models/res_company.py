@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import api, models, fields
 
 
 class ResCompany(models.Model):
@@ -18,3 +18,14 @@ class ResCompany(models.Model):
         string='Apps Menu Background Image',
         attachment=True
     )
+
+    #----------------------------------------------------------
+    # Helper
+    #----------------------------------------------------------
+
+    @api.model
+    def _get_session_image_fields(self):
+        return {
+            **super()._get_session_image_fields(),
+            'background_image': 'has_background_image',
+        }
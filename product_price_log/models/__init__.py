@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from . import models
-from . import price_comparison_report
\ No newline at end of file
+from . import market_intelligence_line
+# Last: the report tables reference the tables above
+from . import price_comparison_report
@@ -0,0 +1,28 @@
+from odoo import api, models
+
+# Fields copied into the price comparison time series; writes touching none
+# of them leave the report rows alone
+MI_LINE_REPORT_FIELDS = {'mi_date', 'product_id', 'competitor_id', 'unit_price'}
+
+
+class MarketIntelligenceLine(models.Model):
+    _inherit = "market_intelligence.market_intelligence_line"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self.env['price.comparison.report']._refresh_report_rows(mi_line_ids=lines.ids)
+        return lines
+
+    def write(self, vals):
+        res = super().write(vals)
+        if MI_LINE_REPORT_FIELDS.intersection(vals):
+            self.env['price.comparison.report']._refresh_report_rows(mi_line_ids=self.ids)
+        return res
+
+    def unlink(self):
+        # The report rows go with the lines (ON DELETE CASCADE), their buckets stay
+        keys = self.env['price.comparison.report']._get_bucket_keys(mi_line_ids=self.ids)
+        res = super().unlink()
+        self.env['price.comparison.ohlc']._refresh_buckets(keys)
+        return res
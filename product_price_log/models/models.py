@@ -1,9 +1,18 @@
 # -*- coding: utf-8 -*-
 
+from collections import defaultdict
+
 from odoo import models, fields, api
+from odoo.tools import float_compare
 import logging
 
+# Fields copied into the price comparison time series; writes touching none
+# of them leave the report rows alone
+PRICE_LOG_REPORT_FIELDS = {'changed_date', 'product_id', 'new_price'}
+
 _logger = logging.getLogger(__name__)
+
+
 class ProductPriceLog(models.Model):
     _name = "product.price.log"
     _description = "Product Price Log"
@@ -14,40 +23,101 @@ class ProductPriceLog(models.Model):
     changed_date = fields.Datetime(string="Changed On", default=fields.Datetime.now)
     changed_by = fields.Many2one('res.users', string="Changed By", default=lambda self: self.env.user)
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        logs = super().create(vals_list)
+        self.env['price.comparison.report']._refresh_report_rows(price_log_ids=logs.ids)
+        return logs
+
+    def write(self, vals):
+        res = super().write(vals)
+        if PRICE_LOG_REPORT_FIELDS.intersection(vals):
+            self.env['price.comparison.report']._refresh_report_rows(price_log_ids=self.ids)
+        return res
+
+    def unlink(self):
+        # The report rows go with the logs (ON DELETE CASCADE), their buckets stay
+        keys = self.env['price.comparison.report']._get_bucket_keys(price_log_ids=self.ids)
+        res = super().unlink()
+        self.env['price.comparison.ohlc']._refresh_buckets(keys)
+        return res
+
+    @api.model
+    def _log_price_changes(self, products, old_prices):
+        """Log, with one multi-row create, the products whose sales price
+        differs from ``old_prices`` (``{product_id: price}`` read before the
+        write); unchanged prices are skipped."""
+        products.invalidate_recordset(['lst_price'])
+        precision = self.env['decimal.precision'].precision_get('Product Price')
+        vals_list = []
+        for product in products:
+            old_price = old_prices.get(product.id)
+            new_price = product.lst_price
+            if old_price is None or not float_compare(old_price, new_price, precision_digits=precision):
+                continue
+            vals_list.append({
+                'product_id': product.id,
+                'old_price': old_price,
+                'new_price': new_price,
+            })
+        if vals_list:
+            _logger.info("Logging %s product price changes", len(vals_list))
+        return self.create(vals_list)
 
 
 class ProductProduct(models.Model):
     _inherit = "product.product"
 
+    def _get_logged_prices(self):
+        """Current sales prices, computed for the whole recordset at once."""
+        return {product.id: product.lst_price for product in self}
+
     def write(self, vals):
-        res = super().write(vals)
-        if 'lst_price' in vals:
-            for product in self:
-                old_price = product.lst_price
-                new_price = vals['lst_price']
-                if old_price != new_price:
-                    _logger.info("Product %s price changed from %s to %s", product.name, old_price, new_price)
-                    self.env['product.price.log'].create({
-                        'product_id': product.id,
-                        'old_price': old_price,
-                        'new_price': new_price,
-                    })
+        if 'lst_price' not in vals or self.env.context.get('skip_price_log'):
+            return super().write(vals)
+        # lst_price is stored on the template: the sibling variants move too
+        products = self | self.product_tmpl_id.product_variant_ids
+        old_prices = products._get_logged_prices()
+        res = super(ProductProduct, self.with_context(skip_price_log=True)).write(vals)
+        self.env['product.price.log']._log_price_changes(products, old_prices)
         return res
 
+    @api.model
+    def reprice(self, prices):
+        """Set the sales price of many products at once.
+
+        :param prices: ``{product_id: new_price}``
+        :return: the created ``product.price.log`` records
+
+        The templates are written with one ``write`` per distinct list price
+        and all price changes are logged with one ``create``. When several
+        variants of a template are given, the highest product id wins.
+        """
+        products = self.browse(sorted(prices))
+        old_prices = products.product_tmpl_id.product_variant_ids._get_logged_prices()
+        list_prices = {
+            product.product_tmpl_id.id: prices[product.id] - product.price_extra
+            for product in products
+        }
+        template_ids_by_price = defaultdict(list)
+        for template_id, list_price in list_prices.items():
+            template_ids_by_price[list_price].append(template_id)
+        Template = self.env['product.template'].with_context(skip_price_log=True)
+        for list_price, template_ids in template_ids_by_price.items():
+            Template.browse(template_ids).write({'list_price': list_price})
+        return self.env['product.price.log']._log_price_changes(
+            products.product_tmpl_id.product_variant_ids, old_prices,
+        )
+
+
 class ProductTemplate(models.Model):
     _inherit = "product.template"
 
     def write(self, vals):
-        if 'list_price' in vals:
-            for template in self:
-                old_price = template.list_price
-                new_price = vals['list_price']
-                for product in template.product_variant_ids:
-                        self.env['product.price.log'].create({
-                            'product_id': product.id,
-                            'old_price': old_price,
-                            'new_price': new_price,
-                        })
+        if 'list_price' not in vals or self.env.context.get('skip_price_log'):
+            return super().write(vals)
+        products = self.product_variant_ids
+        old_prices = products._get_logged_prices()
         res = super().write(vals)
-
+        self.env['product.price.log']._log_price_changes(products, old_prices)
         return res
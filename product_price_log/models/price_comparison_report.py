@@ -1,47 +1,251 @@
+import logging
+from datetime import timedelta
+
 from odoo import models, fields, api
 
+_logger = logging.getLogger(__name__)
+
+SOURCES = [
+    ('your', 'AMG Price'),
+    ('competitor', 'Competitor Price'),
+]
+
+
 class PriceComparisonReport(models.Model):
+    """Price time series of our products and of the competitors.
+
+    ``price_comparison_report`` is a real table holding one row per
+    ``product.price.log`` (id ``2 * id``) and per market intelligence line
+    (id ``2 * id + 1``). Rows are refreshed from the create/write hooks of
+    both sources and removed by ``ON DELETE CASCADE``; every refresh also
+    recomputes the ``price.comparison.ohlc`` buckets it touched.
+    """
     _name = "price.comparison.report"
     _description = "Price vs Competitor Report"
-    _auto = False  # SQL view, not a real table
-    _order = "date asc"
+    _auto = False
+    _order = "date asc, id asc"
 
     date = fields.Date("Date")
     product_id = fields.Many2one("product.product", string="Product")
     competitor_id = fields.Many2one("competitor.competitor", string="Competitor")
-    source = fields.Selection([
-        ('your', 'AMG Price'),
-        ('competitor', 'Competitor Price')
-    ], string="Source")
+    source = fields.Selection(SOURCES, string="Source")
     price = fields.Float("Price")
+    price_log_id = fields.Many2one("product.price.log", string="Price Log")
+    mi_line_id = fields.Many2one("market_intelligence.market_intelligence_line", string="Market Intelligence Line")
+
+    def init(self):
+        cr = self.env.cr
+        cr.execute("SELECT relkind FROM pg_class WHERE relname = %s", (self._table,))
+        row = cr.fetchone()
+        if row and row[0] == 'v':
+            # Previous versions exposed the report as an ordered UNION view
+            cr.execute("DROP VIEW price_comparison_report CASCADE")
+            row = None
+        cr.execute("""
+            CREATE TABLE IF NOT EXISTS price_comparison_report (
+                id            INTEGER PRIMARY KEY,
+                date          DATE,
+                product_id    INTEGER REFERENCES product_product (id) ON DELETE CASCADE,
+                competitor_id INTEGER REFERENCES competitor_competitor (id) ON DELETE SET NULL,
+                source        VARCHAR,
+                price         DOUBLE PRECISION,
+                price_log_id  INTEGER UNIQUE REFERENCES product_price_log (id) ON DELETE CASCADE,
+                mi_line_id    INTEGER UNIQUE
+                              REFERENCES market_intelligence_market_intelligence_line (id) ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS price_comparison_report_product_date_index
+                ON price_comparison_report (product_id, date);
+            CREATE INDEX IF NOT EXISTS price_comparison_report_competitor_date_index
+                ON price_comparison_report (competitor_id, date);
+            CREATE INDEX IF NOT EXISTS price_comparison_report_date_index
+                ON price_comparison_report (date);
+        """)
+        if not row:
+            self.env['price.comparison.ohlc'].init()
+            self._rebuild_report()
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def _select_price_logs(self, where=""):
+        return """
+            SELECT ppl.id * 2                as id,
+                   ppl.changed_date::date    as date,
+                   ppl.product_id,
+                   NULL::int                 as competitor_id,
+                   'your'::varchar           as source,
+                   ppl.new_price             as price,
+                   ppl.id                    as price_log_id,
+                   NULL::int                 as mi_line_id
+              FROM product_price_log ppl
+            %s
+        """ % where
+
+    def _select_mi_lines(self, where=""):
+        return """
+            SELECT mil.id * 2 + 1            as id,
+                   mil.mi_date               as date,
+                   mil.product_id,
+                   mil.competitor_id,
+                   'competitor'::varchar     as source,
+                   mil.unit_price            as price,
+                   NULL::int                 as price_log_id,
+                   mil.id                    as mi_line_id
+              FROM market_intelligence_market_intelligence_line mil
+            %s
+        """ % where
+
+    @api.model
+    def _get_bucket_keys(self, price_log_ids=(), mi_line_ids=()):
+        """``(product_id, date)`` of the rows of the given sources."""
+        self.env.cr.execute("""
+            SELECT DISTINCT product_id, date
+              FROM price_comparison_report
+             WHERE price_log_id = ANY(%s) OR mi_line_id = ANY(%s)
+        """, (list(price_log_ids), list(mi_line_ids)))
+        return set(self.env.cr.fetchall())
+
+    @api.model
+    def _refresh_report_rows(self, price_log_ids=(), mi_line_ids=()):
+        """Re-copy the given sources into the time series (upsert by source
+        id) and recompute the OHLC buckets of their old and new dates."""
+        if not price_log_ids and not mi_line_ids:
+            return
+        cr = self.env.cr
+        keys = self._get_bucket_keys(price_log_ids, mi_line_ids)
+        if price_log_ids:
+            self.env['product.price.log'].flush_model()
+            ids = tuple(price_log_ids)
+            cr.execute("DELETE FROM price_comparison_report WHERE price_log_id IN %s", (ids,))
+            cr.execute("INSERT INTO price_comparison_report " + self._select_price_logs("WHERE ppl.id IN %s")
+                       + " RETURNING product_id, date", (ids,))
+            keys.update(cr.fetchall())
+        if mi_line_ids:
+            self.env['market_intelligence.market_intelligence_line'].flush_model()
+            ids = tuple(mi_line_ids)
+            cr.execute("DELETE FROM price_comparison_report WHERE mi_line_id IN %s", (ids,))
+            cr.execute("INSERT INTO price_comparison_report " + self._select_mi_lines("WHERE mil.id IN %s")
+                       + " RETURNING product_id, date", (ids,))
+            keys.update(cr.fetchall())
+        self.invalidate_model()
+        self.env['price.comparison.ohlc']._refresh_buckets(keys)
+
+    @api.model
+    def _rebuild_report(self):
+        """Rebuild the time series and all OHLC buckets from both sources."""
+        self.env['product.price.log'].flush_model()
+        self.env['market_intelligence.market_intelligence_line'].flush_model()
+        cr = self.env.cr
+        cr.execute("TRUNCATE price_comparison_report")
+        cr.execute("INSERT INTO price_comparison_report " + self._select_price_logs())
+        cr.execute("INSERT INTO price_comparison_report " + self._select_mi_lines())
+        cr.execute("ANALYZE price_comparison_report")
+        self.invalidate_model()
+        self.env['price.comparison.ohlc']._rebuild_buckets()
+        _logger.info("Rebuilt %s from the price logs and market intelligence lines", self._table)
+
+    @api.model
+    def action_rebuild_report(self):
+        """Full rebuild, exposed as a server action for administrators."""
+        self._rebuild_report()
+        return True
+
+
+class PriceComparisonOhlc(models.Model):
+    """Daily and weekly open/high/low/close buckets of the price time series,
+    per product, competitor and source; the comparison graph and pivot read
+    these instead of the raw prices."""
+    _name = "price.comparison.ohlc"
+    _description = "Price vs Competitor Buckets"
+    _auto = False
+    _order = "date asc, id asc"
+
+    period = fields.Selection([('day', 'Day'), ('week', 'Week')], string="Period", readonly=True)
+    date = fields.Date("Date", readonly=True)
+    product_id = fields.Many2one("product.product", string="Product", readonly=True)
+    competitor_id = fields.Many2one("competitor.competitor", string="Competitor", readonly=True)
+    source = fields.Selection(SOURCES, string="Source", readonly=True)
+    open_price = fields.Float("Open", readonly=True, group_operator='avg')
+    high_price = fields.Float("High", readonly=True, group_operator='max')
+    low_price = fields.Float("Low", readonly=True, group_operator='min')
+    close_price = fields.Float("Close", readonly=True, group_operator='avg')
+    avg_price = fields.Float("Average", readonly=True, group_operator='avg')
+    nbr_prices = fields.Integer("# Prices", readonly=True)
 
     def init(self):
-        """SQL View: merge product price log + competitor price"""
         self.env.cr.execute("""
-            CREATE OR REPLACE VIEW price_comparison_report AS (
-                SELECT * FROM (
-                    -- Your product price log
-                    SELECT
-                        ppl.id as id,
-                        ppl.changed_date::date as date,
-                        ppl.product_id,
-                        NULL::int as competitor_id,
-                        'your'::varchar as source,
-                        ppl.new_price as price
-                    FROM product_price_log ppl
-
-                    UNION ALL
-
-                    -- Competitor market intelligence
-                    SELECT
-                        mil.id + 1000000 as id,
-                        mil.mi_date as date,
-                        mil.product_id,
-                        mil.competitor_id,
-                        'competitor'::varchar as source,
-                        mil.unit_price as price
-                    FROM market_intelligence_market_intelligence_line mil
-                ) AS all_data
-                ORDER BY date ASC, id ASC
-            )
-    """)
+            CREATE TABLE IF NOT EXISTS price_comparison_ohlc (
+                id            SERIAL PRIMARY KEY,
+                period        VARCHAR NOT NULL,
+                date          DATE NOT NULL,
+                product_id    INTEGER REFERENCES product_product (id) ON DELETE CASCADE,
+                competitor_id INTEGER REFERENCES competitor_competitor (id) ON DELETE SET NULL,
+                source        VARCHAR,
+                open_price    DOUBLE PRECISION,
+                high_price    DOUBLE PRECISION,
+                low_price     DOUBLE PRECISION,
+                close_price   DOUBLE PRECISION,
+                avg_price     DOUBLE PRECISION,
+                nbr_prices    INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS price_comparison_ohlc_period_product_date_index
+                ON price_comparison_ohlc (period, product_id, date);
+            CREATE INDEX IF NOT EXISTS price_comparison_ohlc_period_competitor_date_index
+                ON price_comparison_ohlc (period, competitor_id, date);
+            CREATE INDEX IF NOT EXISTS price_comparison_ohlc_period_date_index
+                ON price_comparison_ohlc (period, date);
+        """)
+
+    def _insert_buckets(self, period, where="", params=()):
+        trunc = "r.date" if period == 'day' else "date_trunc('week', r.date)::date"
+        self.env.cr.execute("""
+            INSERT INTO price_comparison_ohlc (period, date, product_id, competitor_id, source, open_price,
+                                               high_price, low_price, close_price, avg_price, nbr_prices)
+            SELECT %%s, %s, r.product_id, r.competitor_id, r.source,
+                   (array_agg(r.price ORDER BY r.date, r.id))[1],
+                   MAX(r.price),
+                   MIN(r.price),
+                   (array_agg(r.price ORDER BY r.date DESC, r.id DESC))[1],
+                   AVG(r.price),
+                   COUNT(*)
+              FROM price_comparison_report r
+             WHERE r.date IS NOT NULL AND r.product_id IS NOT NULL %s
+          GROUP BY 2, r.product_id, r.competitor_id, r.source
+        """ % (trunc, where), (period, *params))
+
+    @api.model
+    def _refresh_buckets(self, keys):
+        """Recompute the day and week buckets of the ``(product_id, date)`` keys."""
+        keys = {(product_id, date) for product_id, date in keys if product_id and date}
+        if not keys:
+            return
+        for period, days in (('day', 1), ('week', 7)):
+            buckets = {
+                (product_id, date if period == 'day' else date - timedelta(days=date.weekday()))
+                for product_id, date in keys
+            }
+            product_ids = [product_id for product_id, _date in buckets]
+            dates = [date for _product_id, date in buckets]
+            self.env.cr.execute("""
+                DELETE FROM price_comparison_ohlc
+                 WHERE period = %s
+                   AND (product_id, date) IN (SELECT * FROM unnest(%s::int[], %s::date[]))
+            """, (period, product_ids, dates))
+            # Every day of the buckets, so the (product_id, date) index is used
+            self._insert_buckets(period, """
+                AND (r.product_id, r.date) IN (
+                    SELECT k.product_id, day::date
+                      FROM unnest(%s::int[], %s::date[]) AS k(product_id, date),
+                           generate_series(k.date, k.date + %s, '1 day') AS day
+                )
+            """, (product_ids, dates, days - 1))
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild_buckets(self):
+        self.env.cr.execute("TRUNCATE price_comparison_ohlc")
+        for period in ('day', 'week'):
+            self._insert_buckets(period)
+        self.env.cr.execute("ANALYZE price_comparison_ohlc")
+        self.invalidate_model()
@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from odoo import api, fields, models
 
 class SaleOrder(models.Model):
@@ -11,32 +13,59 @@ class SaleOrder(models.Model):
     )
 
     def _create_invoices(self, grouped=False, final=False):
-        for order in self:
-            if order.is_credit and order.state in ['sale', 'done']:
-                for line in order.order_line.filtered(lambda l: not l.display_type):
-                    line.qty_to_invoice = line.product_uom_qty - line.qty_invoiced
+        self._set_credit_qty_to_invoice()
 
         invoices = super()._create_invoices(grouped=grouped, final=final)
 
-        for order in self.filtered(lambda o: o.is_credit and o.state in ['sale', 'done']):
-            for line in order.order_line:
-                if line.product_uom_qty <= line.qty_invoiced:
-                    line.qty_to_invoice = 0
+        self._filter_credit_orders().order_line.filtered(
+            lambda l: l.qty_to_invoice and l.product_uom_qty <= l.qty_invoiced
+        ).write({'qty_to_invoice': 0})
 
         self._compute_invoice_status()
         return invoices
 
     def _compute_invoice_status(self):
-        for order in self:
-            if order.is_credit and order.state in ['sale', 'done']:
-                all_invoiced = all(
-                    line.qty_invoiced >= line.product_uom_qty
-                    for line in order.order_line
-                    if not line.display_type
-                )
-                order.invoice_status = 'invoiced' if all_invoiced else 'to invoice'
-            else:
-                super(SaleOrder, order)._compute_invoice_status()
+        credit_orders = self._filter_credit_orders()
+        super(SaleOrder, self - credit_orders)._compute_invoice_status()
+        # Orders being edited only exist in the cache
+        new_orders = credit_orders.filtered(lambda o: isinstance(o.id, models.NewId))
+        for order in new_orders:
+            all_invoiced = all(
+                line.qty_invoiced >= line.product_uom_qty
+                for line in order.order_line
+                if not line.display_type
+            )
+            order.invoice_status = 'invoiced' if all_invoiced else 'to invoice'
+        to_invoice_ids = (credit_orders - new_orders)._get_partially_invoiced_ids()
+        for order in credit_orders - new_orders:
+            order.invoice_status = 'to invoice' if order.id in to_invoice_ids else 'invoiced'
+
+    def _filter_credit_orders(self):
+        return self.filtered(lambda o: o.is_credit and o.state in ['sale', 'done'])
+
+    def _set_credit_qty_to_invoice(self):
+        """Make the whole ordered quantity of credit orders invoiceable, with
+        one write per quantity instead of one per line."""
+        lines = self._filter_credit_orders().order_line.filtered(lambda l: not l.display_type)
+        line_ids_by_qty = defaultdict(list)
+        for line in lines:
+            line_ids_by_qty[line.product_uom_qty - line.qty_invoiced].append(line.id)
+        for qty, line_ids in line_ids_by_qty.items():
+            lines.browse(line_ids).write({'qty_to_invoice': qty})
+
+    def _get_partially_invoiced_ids(self):
+        """Ids of the orders having a product line not fully invoiced."""
+        if not self:
+            return set()
+        self.env['sale.order.line'].flush_model(['order_id', 'display_type', 'product_uom_qty', 'qty_invoiced'])
+        self.env.cr.execute("""
+            SELECT DISTINCT order_id
+              FROM sale_order_line
+             WHERE order_id IN %s
+               AND display_type IS NULL
+               AND qty_invoiced < product_uom_qty
+        """, [tuple(self.ids)])
+        return {order_id for order_id, in self.env.cr.fetchall()}
 
 
 class SaleOrderLine(models.Model):
@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from odoo import models, fields, api
 from odoo.exceptions import AccessError
 
@@ -31,16 +33,22 @@ class SaleOrder(models.Model):
 
         # If the location_id was changed, update related manufacturing orders
         if 'location_id' in vals:
-            for order in self:
-                # Search by origin only, since sale_order_id doesn't exist on mrp.production
-                mo_list = self.env['mrp.production'].search([
-                    ('origin', '=', order.name)
-                ])
-
-                # Update only active (non-done/non-cancelled) MOs
-                if mo_list:
-                    mo_list.filtered(
-                        lambda m: m.state not in ['done', 'cancel']
-                    ).sudo().write({'location_id': order.location_id.id})
+            self._propagate_location_to_productions()
 
         return res
+
+    def _propagate_location_to_productions(self):
+        """Copy the location of the orders to their active manufacturing orders,
+        with one search for all the orders and one write per location."""
+        orders_by_name = {order.name: order for order in self}
+        # Search by origin only, since sale_order_id doesn't exist on mrp.production
+        # Update only active (non-done/non-cancelled) MOs
+        productions = self.env['mrp.production'].search([
+            ('origin', 'in', list(orders_by_name)),
+            ('state', 'not in', ['done', 'cancel']),
+        ])
+        productions_by_location = defaultdict(lambda: self.env['mrp.production'])
+        for production in productions:
+            productions_by_location[orders_by_name[production.origin].location_id.id] |= production
+        for location_id, location_productions in productions_by_location.items():
+            location_productions.sudo().write({'location_id': location_id})